@@ -1,12 +1,11 @@
 """karpo-context: Shared package for managing agent conversation context."""
-from karpo_context.budget import ContextBudget, TokenBudgetManager
+from karpo_context.budget import BudgetCheck, ContextBudget, TokenBudgetManager
 from karpo_context.compaction.base import CompactionTrigger, Summarizer
 from karpo_context.compaction.message_count import MessageCountTrigger
 from karpo_context.compaction.summarizer import LLMSummarizer
 from karpo_context.config import CONTEXT_CONFIGS, ContextConfig, get_config
 from karpo_context.defaults import CONTEXT_REDIS_URL, create_context_store
 from karpo_context.manager import ContextManager
-from karpo_context.pipeline import ContextPipeline
 from karpo_context.models import (
     ChatMessage,
     ConversationContext,
@@ -14,8 +13,9 @@ from karpo_context.models import (
     SessionState,
     ToolCallRecord,
 )
+from karpo_context.pipeline import ContextPipeline
 from karpo_context.store.base import ContextStore
-from karpo_context.store.redis_store import RedisContextStore
+from karpo_context.store.redis_store import RedisContextStore, close_all_pools
 from karpo_context.store.session_store import SessionStateStore
 
 __all__ = [
@@ -26,6 +26,7 @@ __all__ = [
     "ConversationSummary",
     "SessionState",
     # Budget management
+    "BudgetCheck",
     "ContextBudget",
     "TokenBudgetManager",
     # Configuration
@@ -36,6 +37,7 @@ __all__ = [
     "ContextStore",
     "RedisContextStore",
     "SessionStateStore",
+    "close_all_pools",
     # Compaction
     "CompactionTrigger",
     "Summarizer",
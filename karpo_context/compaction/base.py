@@ -7,6 +7,8 @@ from karpo_context.models import ChatMessage, ConversationContext
 class CompactionTrigger(ABC):
     """Determines when conversation context should be compacted."""
 
+    __slots__ = ()
+
     @abstractmethod
     def should_compact(self, context: ConversationContext) -> bool:
         """Return True if the context should be compacted."""
@@ -6,8 +6,12 @@ from karpo_context.models import ConversationContext
 class MessageCountTrigger(CompactionTrigger):
     """Triggers compaction when message count exceeds a threshold."""
 
+    __slots__ = ("_threshold",)
+
     def __init__(self, threshold: int = 50) -> None:
         self._threshold = threshold
 
     def should_compact(self, context: ConversationContext) -> bool:
+        # The list length, not message_count: compaction splits the list,
+        # so a count that drifted above it would summarize nothing
         return len(context.messages) > self._threshold
@@ -22,6 +22,16 @@ Previous summary to incorporate and update:
 
 """
 
+# Fixed pieces of the default templates, split once so prompts are built by
+# concatenation instead of re-parsing the templates with str.format
+_PROMPT_HEAD, _, _PROMPT_BODY = _DEFAULT_PROMPT_TEMPLATE.partition(
+    "{existing_summary_section}"
+)
+_MESSAGES_HEAD, _, _PROMPT_TAIL = _PROMPT_BODY.partition("{messages}")
+_SUMMARY_HEAD, _, _SUMMARY_TAIL = _EXISTING_SUMMARY_SECTION.partition(
+    "{existing_summary}"
+)
+
 
 class LLMSummarizer(Summarizer):
     """Summarizes messages using an LLM callable."""
@@ -35,11 +45,9 @@ class LLMSummarizer(Summarizer):
         self._prompt_template = prompt_template
 
     def _format_messages(self, messages: list[ChatMessage]) -> str:
-        lines = []
-        for msg in messages:
-            content = msg.content or ""
-            lines.append(f"{msg.role}: {content}")
-        return "\n".join(lines)
+        return "\n".join(
+            msg.role + ": " + (msg.content or "") for msg in messages
+        )
 
     def _build_prompt(
         self,
@@ -52,16 +60,12 @@ class LLMSummarizer(Summarizer):
             return self._prompt_template.format(messages=formatted_messages)
 
         if existing_summary:
-            existing_summary_section = _EXISTING_SUMMARY_SECTION.format(
-                existing_summary=existing_summary
+            return (
+                _PROMPT_HEAD + _SUMMARY_HEAD + existing_summary + _SUMMARY_TAIL
+                + _MESSAGES_HEAD + formatted_messages + _PROMPT_TAIL
             )
-        else:
-            existing_summary_section = ""
 
-        return _DEFAULT_PROMPT_TEMPLATE.format(
-            existing_summary_section=existing_summary_section,
-            messages=formatted_messages,
-        )
+        return _PROMPT_HEAD + _MESSAGES_HEAD + formatted_messages + _PROMPT_TAIL
 
     async def summarize(
         self,
@@ -1,7 +1,9 @@
 """Context configuration and presets."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+from types import MappingProxyType
 
 from karpo_context.budget import ContextBudget
 
@@ -20,6 +22,8 @@ class ContextConfig:
     summary_trigger_threshold: int = 20  # Trigger after N turns
     enable_proactive_summary: bool = True
     proactive_summary_threshold: float = 0.7  # Trigger at 70% capacity
+    # With an existing summary, only send turns it doesn't cover yet
+    summary_incremental: bool = True
 
     # Feature toggles
     enable_emotional_context: bool = True
@@ -39,8 +43,8 @@ class ContextConfig:
     })
 
 
-# Preset configurations for different use cases
-CONTEXT_CONFIGS: dict[str, ContextConfig] = {
+# Preset configurations for different use cases (read-only)
+CONTEXT_CONFIGS: Mapping[str, ContextConfig] = MappingProxyType({
     "fast": ContextConfig(
         budget=ContextBudget(
             total_limit=4000,
@@ -89,7 +93,7 @@ CONTEXT_CONFIGS: dict[str, ContextConfig] = {
         enable_proactive_summary=True,
         proactive_summary_threshold=0.75,
     ),
-}
+})
 
 # Default config (same as personalized)
 _DEFAULT_CONFIG = ContextConfig()
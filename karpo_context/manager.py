@@ -23,15 +23,7 @@ class ContextManager:
 
     async def load(self, conversation_id: int) -> ConversationContext:
         """Load a conversation context, creating a new one if it doesn't exist."""
-        ctx = await self._store.get(conversation_id)
-        if ctx is not None:
-            return ctx
-        now = datetime.now(timezone.utc)
-        return ConversationContext(
-            conversation_id=conversation_id,
-            created_at=now,
-            updated_at=now,
-        )
+        return await self._load(conversation_id, datetime.now(timezone.utc))
 
     async def save(self, context: ConversationContext) -> None:
         """Save a conversation context, compacting if the trigger fires."""
@@ -47,19 +39,32 @@ class ContextManager:
         self, conversation_id: int, message: ChatMessage
     ) -> ConversationContext:
         """Append a message to a conversation, saving afterward."""
-        ctx = await self.load(conversation_id)
+        now = datetime.now(timezone.utc)
+        ctx = await self._load(conversation_id, now)
         ctx.messages.append(message)
         ctx.message_count += 1
-        now = datetime.now(timezone.utc)
         ctx.updated_at = now
         await self.save(ctx)
         return ctx
 
+    async def _load(self, conversation_id: int, now: datetime) -> ConversationContext:
+        """Load a conversation context, creating one timestamped at ``now``."""
+        ctx = await self._store.get(conversation_id)
+        if ctx is not None:
+            return ctx
+        return ConversationContext(
+            conversation_id=conversation_id,
+            created_at=now,
+            updated_at=now,
+        )
+
     async def _compact(self, context: ConversationContext) -> None:
         """Summarize older messages, keeping only the most recent ones."""
-        to_compress = context.messages[: -self._keep_recent]
-        to_keep = context.messages[-self._keep_recent :]
+        messages = context.messages
+        split = max(0, len(messages) - self._keep_recent)
+        to_compress = messages[:split]
         summary = await self._summarizer.summarize(to_compress, context.summary)
         context.summary = summary
-        context.messages = to_keep
-        context.message_count = len(to_keep)
+        # Trim in place rather than copying the kept tail into a new list
+        del messages[:split]
+        context.message_count = len(messages)
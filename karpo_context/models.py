@@ -1,12 +1,27 @@
 """Data models for conversation context."""
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
+from karpo_context.budget import _count_chinese
 
-@dataclass
+# Bound once; (de)serializers call these per timestamp
+_fromisoformat = datetime.fromisoformat
+_isoformat = datetime.isoformat
+# Decoded roles are fresh strings; interning shares one object per role
+# across every loaded message
+_intern = sys.intern
+
+
+@dataclass(frozen=True, slots=True)
 class ChatMessage:
-    """A single message in a conversation."""
+    """A single message in a conversation.
+
+    Messages are immutable once created, so the serialized form and the
+    Chinese character count are computed once and reused on every save
+    and token estimate.
+    """
 
     role: str
     content: str | None
@@ -14,34 +29,52 @@ class ChatMessage:
     name: str | None = None
     tool_call_id: str | None = None
     tool_calls: list[dict[str, Any]] | None = None
+    _dict: dict[str, Any] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _chinese_chars: int | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def chinese_chars(self) -> int:
+        """Number of Chinese characters in the content."""
+        count = self._chinese_chars
+        if count is None:
+            count = _count_chinese(self.content) if self.content else 0
+            object.__setattr__(self, "_chinese_chars", count)
+        return count
 
     def to_dict(self) -> dict[str, Any]:
-        d: dict[str, Any] = {
-            "role": self.role,
-            "content": self.content,
-            "created_at": self.created_at.isoformat(),
-        }
-        if self.name is not None:
-            d["name"] = self.name
-        if self.tool_call_id is not None:
-            d["tool_call_id"] = self.tool_call_id
-        if self.tool_calls is not None:
-            d["tool_calls"] = self.tool_calls
-        return d
+        d = self._dict
+        if d is None:
+            d = {
+                "role": self.role,
+                "content": self.content,
+                "created_at": _isoformat(self.created_at),
+            }
+            if self.name is not None:
+                d["name"] = self.name
+            if self.tool_call_id is not None:
+                d["tool_call_id"] = self.tool_call_id
+            if self.tool_calls is not None:
+                d["tool_calls"] = self.tool_calls
+            object.__setattr__(self, "_dict", d)
+        return dict(d)
 
     @classmethod
     def from_dict(cls, d: dict[str, Any]) -> "ChatMessage":
         return cls(
-            role=d["role"],
+            role=_intern(d["role"]),
             content=d["content"],
-            created_at=datetime.fromisoformat(d["created_at"]),
+            created_at=_fromisoformat(d["created_at"]),
             name=d.get("name"),
             tool_call_id=d.get("tool_call_id"),
             tool_calls=d.get("tool_calls"),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallRecord:
     """Record of a tool call execution."""
 
@@ -56,7 +89,7 @@ class ToolCallRecord:
             "tool_name": self.tool_name,
             "arguments": self.arguments,
             "result": self.result,
-            "called_at": self.called_at.isoformat(),
+            "called_at": _isoformat(self.called_at),
             "duration_ms": self.duration_ms,
         }
 
@@ -66,12 +99,12 @@ class ToolCallRecord:
             tool_name=d["tool_name"],
             arguments=d["arguments"],
             result=d["result"],
-            called_at=datetime.fromisoformat(d["called_at"]),
+            called_at=_fromisoformat(d["called_at"]),
             duration_ms=d["duration_ms"],
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationContext:
     """Full context for a conversation."""
 
@@ -93,8 +126,8 @@ class ConversationContext:
     def to_dict(self) -> dict[str, Any]:
         return {
             "conversation_id": self.conversation_id,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": _isoformat(self.created_at),
+            "updated_at": _isoformat(self.updated_at),
             "messages": [m.to_dict() for m in self.messages],
             "summary": self.summary,
             "persona": self.persona,
@@ -112,17 +145,16 @@ class ConversationContext:
     def from_dict(cls, d: dict[str, Any]) -> "ConversationContext":
         return cls(
             conversation_id=d["conversation_id"],
-            created_at=datetime.fromisoformat(d["created_at"]),
-            updated_at=datetime.fromisoformat(d["updated_at"]),
-            messages=[ChatMessage.from_dict(m) for m in d.get("messages", [])],
+            created_at=_fromisoformat(d["created_at"]),
+            updated_at=_fromisoformat(d["updated_at"]),
+            messages=list(map(ChatMessage.from_dict, d.get("messages") or ())),
             summary=d.get("summary"),
             persona=d.get("persona"),
             loaded_tools=d.get("loaded_tools", []),
             loaded_skills=d.get("loaded_skills", []),
-            tool_call_history=[
-                ToolCallRecord.from_dict(t)
-                for t in d.get("tool_call_history", [])
-            ],
+            tool_call_history=list(
+                map(ToolCallRecord.from_dict, d.get("tool_call_history") or ())
+            ),
             phase=d.get("phase", "idle"),
             slots=d.get("slots", {}),
             missing_slots=d.get("missing_slots", []),
@@ -131,7 +163,7 @@ class ConversationContext:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationSummary:
     """Structured conversation summary generated by LLM.
 
@@ -153,7 +185,7 @@ class ConversationSummary:
     def to_dict(self) -> dict[str, Any]:
         d: dict[str, Any] = {
             "covers_until_turn": self.covers_until_turn,
-            "generated_at": self.generated_at.isoformat(),
+            "generated_at": _isoformat(self.generated_at),
             "user_intent": self.user_intent,
             "key_entities": self.key_entities,
             "decisions_made": self.decisions_made,
@@ -168,7 +200,7 @@ class ConversationSummary:
         source_range = d.get("source_turn_range")
         return cls(
             covers_until_turn=d["covers_until_turn"],
-            generated_at=datetime.fromisoformat(d["generated_at"]),
+            generated_at=_fromisoformat(d["generated_at"]),
             user_intent=d["user_intent"],
             key_entities=d["key_entities"],
             decisions_made=d["decisions_made"],
@@ -177,7 +209,7 @@ class ConversationSummary:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionState:
     """Session state for a conversation thread.
 
@@ -194,6 +226,41 @@ class SessionState:
     turn_count: int = 0
     summary_refs: list[str] = field(default_factory=list)
     error_refs: list[str] = field(default_factory=list)
+    # Set on any attribute assignment; cleared once the store has written
+    # or just read this state. In-place list edits are caught by comparing
+    # against the _stored_* snapshots below.
+    _dirty: bool = field(default=True, init=False, repr=False, compare=False)
+    # Messages as last written to (or read from) the store's message list,
+    # so the store can push only what was appended since. None forces a
+    # full rewrite.
+    _stored_messages: tuple[ChatMessage, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Encoded state (without messages) as last written or read; None if
+    # unknown.
+    _stored_meta: bytes | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # The store the _stored_* snapshots above belong to
+    _stored_in: Any = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name not in ("_dirty", "_stored_messages", "_stored_meta", "_stored_in"):
+            object.__setattr__(self, "_dirty", True)
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the state changed since it was last saved or loaded."""
+        return self._dirty
+
+    def mark_dirty(self) -> None:
+        """Flag the state as changed after mutating a list in place."""
+        self._dirty = True
+
+    def mark_clean(self) -> None:
+        """Flag the state as matching what is stored."""
+        self._dirty = False
 
     def add_message(
         self,
@@ -207,10 +274,11 @@ class SessionState:
         Increments turn_count only for user messages.
         Returns the created ChatMessage.
         """
+        now = datetime.now(timezone.utc)
         msg = ChatMessage(
             role=role,
             content=content,
-            created_at=datetime.now(timezone.utc),
+            created_at=now,
             tool_calls=tool_calls,
             tool_call_id=tool_call_id,
         )
@@ -219,21 +287,23 @@ class SessionState:
         if role == "user":
             self.turn_count += 1
 
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = now
         return msg
 
-    def to_dict(self) -> dict[str, Any]:
-        return {
+    def to_dict(self, *, include_messages: bool = True) -> dict[str, Any]:
+        d = {
             "thread_id": self.thread_id,
             "user_id": self.user_id,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "messages": [m.to_dict() for m in self.messages],
+            "created_at": _isoformat(self.created_at),
+            "updated_at": _isoformat(self.updated_at),
             "summary": self.summary.to_dict() if self.summary else None,
             "turn_count": self.turn_count,
             "summary_refs": self.summary_refs,
             "error_refs": self.error_refs,
         }
+        if include_messages:
+            d["messages"] = [m.to_dict() for m in self.messages]
+        return d
 
     @classmethod
     def from_dict(cls, d: dict[str, Any]) -> "SessionState":
@@ -241,9 +311,9 @@ class SessionState:
         return cls(
             thread_id=d["thread_id"],
             user_id=d["user_id"],
-            created_at=datetime.fromisoformat(d["created_at"]),
-            updated_at=datetime.fromisoformat(d["updated_at"]),
-            messages=[ChatMessage.from_dict(m) for m in d.get("messages", [])],
+            created_at=_fromisoformat(d["created_at"]),
+            updated_at=_fromisoformat(d["updated_at"]),
+            messages=list(map(ChatMessage.from_dict, d.get("messages") or ())),
             summary=ConversationSummary.from_dict(summary_data) if summary_data else None,
             turn_count=d.get("turn_count", 0),
             summary_refs=d.get("summary_refs", []),
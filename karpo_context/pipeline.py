@@ -1,16 +1,18 @@
 """Context pipeline for assembling conversation context."""
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import datetime, timezone
-from typing import Any, Protocol
-
-from redis.asyncio import Redis
+from typing import TYPE_CHECKING, Any, Protocol
 
 from karpo_context.budget import TokenBudgetManager
 from karpo_context.config import ContextConfig, get_config
-from karpo_context.models import ConversationSummary, SessionState
+from karpo_context.models import ChatMessage, ConversationSummary, SessionState
 from karpo_context.store.session_store import SessionStateStore
 
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
 
 class Summarizer(Protocol):
     """Protocol for summarizer implementations."""
@@ -54,13 +56,18 @@ class ContextPipeline:
         )
         self._budget_manager = TokenBudgetManager(self._config.budget)
         self._summarizer = summarizer
+        self._last_prompt_sizes: (
+            tuple[str, str, str, tuple[int, int, int]] | None
+        ) = None
+        self._last_summary: tuple[str, int] | None = None
 
     async def load(self, thread_id: int, user_id: str) -> SessionState:
         """Load or create a session.
 
-        Stage 1: Load session from Redis or create new one.
+        Stage 1: Load session from Redis or create new one. Loading an
+        existing session also refreshes its TTL.
         """
-        session = await self._store.get(thread_id)
+        session = await self._store.get_and_touch(thread_id)
         if session is None:
             now = datetime.now(timezone.utc)
             session = SessionState(
@@ -91,22 +98,19 @@ class ContextPipeline:
         Stage 3: Calculate token counts and degradation level.
         """
         # Estimate each component
-        persona_tokens = self._budget_manager.estimate_tokens(persona)
-        instruction_tokens = self._budget_manager.estimate_tokens(instruction)
-        emotional_tokens = self._budget_manager.estimate_tokens(emotional_context)
+        persona_tokens, instruction_tokens, emotional_tokens = (
+            self._prompt_token_sizes(persona, instruction, emotional_context)
+        )
 
         # Estimate summary tokens
         summary_tokens = 0
         if session.summary:
-            summary_text = self._format_summary(session.summary)
-            summary_tokens = self._budget_manager.estimate_tokens(summary_text)
+            _, summary_tokens = self._format_summary_and_tokens(session.summary)
 
         # Estimate history tokens
-        history_messages = [
-            {"role": m.role, "content": m.content or ""}
-            for m in session.messages
-        ]
-        history_tokens = self._budget_manager.estimate_messages_tokens(history_messages)
+        history_tokens = self._budget_manager.estimate_chat_messages_tokens(
+            session.messages
+        )
 
         # Calculate total and degradation
         total_tokens = (
@@ -145,13 +149,13 @@ class ContextPipeline:
         Synchronous version - only trims history.
         """
         # Calculate available budget for history
-        persona_tokens = self._budget_manager.estimate_tokens(persona)
-        instruction_tokens = self._budget_manager.estimate_tokens(instruction)
+        persona_tokens, instruction_tokens, _ = self._prompt_token_sizes(
+            persona, instruction
+        )
 
         summary_tokens = 0
         if session.summary:
-            summary_text = self._format_summary(session.summary)
-            summary_tokens = self._budget_manager.estimate_tokens(summary_text)
+            _, summary_tokens = self._format_summary_and_tokens(session.summary)
 
         remaining = self._budget_manager.get_remaining_for_history(
             persona_tokens=persona_tokens,
@@ -159,20 +163,13 @@ class ContextPipeline:
             summary_tokens=summary_tokens,
         )
 
-        # Trim history from oldest if needed
-        messages = list(session.messages)
-        while messages:
-            history_messages = [
-                {"role": m.role, "content": m.content or ""}
-                for m in messages
-            ]
-            history_tokens = self._budget_manager.estimate_messages_tokens(history_messages)
-            if history_tokens <= remaining:
-                break
-            # Remove oldest message
-            messages.pop(0)
-
-        session.messages = messages
+        # Trim history from oldest if needed; the list is only copied when
+        # something is actually dropped
+        start = self._budget_manager.trim_chat_messages_start(
+            session.messages, remaining
+        )
+        if start:
+            session.messages = session.messages[start:]
         return session
 
     async def compress_async(
@@ -193,19 +190,30 @@ class ContextPipeline:
             and self._summarizer is not None
             and len(session.messages) > 0
         ):
-            # Generate summary from messages
-            history_messages = [
-                {"role": m.role, "content": m.content or ""}
-                for m in session.messages
-            ]
+            # Generate summary from messages. Turns already in an existing
+            # summary are not sent again; every turn after it is, including
+            # ones compressions since then left in the window.
+            messages = session.messages
             existing_summary = None
             if session.summary:
-                existing_summary = self._format_summary(session.summary)
+                existing_summary, _ = self._format_summary_and_tokens(
+                    session.summary
+                )
+                if self._config.summary_incremental:
+                    start = self._unsummarized_start(
+                        messages, session.turn_count, session.summary.covers_until_turn
+                    )
+                    messages = messages[start:]
+            history_messages = [
+                {"role": m.role, "content": m.content or ""} for m in messages
+            ]
 
             summary = await self._summarizer.summarize(
                 history_messages, existing_summary
             )
-            session.summary = summary
+            # Summarizers don't see turn numbers; the summary covers up to
+            # the current turn, which the next one resumes from
+            session.summary = replace(summary, covers_until_turn=session.turn_count)
 
         # Apply sync compression (history trimming)
         return self.compress(session, persona, instruction)
@@ -222,19 +230,24 @@ class ContextPipeline:
         Stage 5: Build system prompt and messages list.
         """
         # Build system prompt
-        system_parts = [persona]
+        use_emotional = emotional_context and self._config.enable_emotional_context
+        if not session.summary and not use_emotional:
+            # Common case: persona and optional instruction only
+            system_prompt = f"{persona}\n\n{instruction}" if instruction else persona
+        else:
+            system_parts = [persona]
 
-        if instruction:
-            system_parts.append(f"\n\n{instruction}")
+            if instruction:
+                system_parts.append(f"\n\n{instruction}")
 
-        if session.summary:
-            summary_text = self._format_summary(session.summary)
-            system_parts.append(f"\n\n## Conversation Summary\n{summary_text}")
+            if session.summary:
+                summary_text, _ = self._format_summary_and_tokens(session.summary)
+                system_parts.append(f"\n\n## Conversation Summary\n{summary_text}")
 
-        if emotional_context and self._config.enable_emotional_context:
-            system_parts.append(f"\n\n## Context\n{emotional_context}")
+            if use_emotional:
+                system_parts.append(f"\n\n## Context\n{emotional_context}")
 
-        system_prompt = "".join(system_parts)
+            system_prompt = "".join(system_parts)
 
         # Build messages list
         messages = [
@@ -253,15 +266,97 @@ class ContextPipeline:
         session: SessionState,
         assistant_response: str,
         tool_calls: list[dict[str, Any]] | None = None,
+        *,
+        error: dict[str, Any] | None = None,
+        summary_backup: dict[str, Any] | None = None,
+        durable: bool = True,
     ) -> SessionState:
         """Save session with assistant response.
 
-        Stage 6: Add assistant message and persist to Redis.
+        Stage 6: Add assistant message and persist to Redis. An error or
+        summary backup from this turn is written in the same round-trip.
+        With ``durable=False`` the write happens in the background and a
+        crash can lose this turn; writes stay in order only within one
+        store, so every worker handling a thread must share this pipeline's
+        store.
         """
         session.add_message("assistant", assistant_response, tool_calls=tool_calls)
-        await self._store.save(session)
+        if durable:
+            await self._store.commit_turn(
+                session, error=error, summary_backup=summary_backup
+            )
+        else:
+            await self._store.commit_turn_in_background(
+                session, error=error, summary_backup=summary_backup
+            )
         return session
 
+    async def drain(self) -> None:
+        """Wait for background writes from complete() to reach Redis."""
+        await self._store.drain()
+
+    @staticmethod
+    def _unsummarized_start(
+        messages: list[ChatMessage], turn_count: int, covers_until_turn: int
+    ) -> int:
+        """Index of the first message an existing summary doesn't fully cover.
+
+        That is the user message opening turn ``covers_until_turn``: a
+        summary is made before that turn's reply, so the reply still needs
+        summarizing. The last user message is turn ``turn_count``. Returns
+        0 when that turn is no longer in the window.
+        """
+        turn = turn_count
+        for i in range(len(messages) - 1, -1, -1):
+            if messages[i].role == "user":
+                if turn <= covers_until_turn:
+                    return i
+                turn -= 1
+        return 0
+
+    def _prompt_token_sizes(
+        self, persona: str, instruction: str, emotional_context: str = ""
+    ) -> tuple[int, int, int]:
+        """Estimate persona, instruction and emotional context tokens.
+
+        The last result is memoized against the exact string objects, so
+        the stages of one turn share a single estimate. Holding references
+        to the strings keeps the identity check safe.
+        """
+        last = self._last_prompt_sizes
+        if (
+            last is not None
+            and last[0] is persona
+            and last[1] is instruction
+            and last[2] is emotional_context
+        ):
+            return last[3]
+        persona_tokens, instruction_tokens, emotional_tokens = (
+            self._budget_manager.estimate_tokens_bulk(
+                (persona, instruction, emotional_context)
+            )
+        )
+        sizes = (persona_tokens, instruction_tokens, emotional_tokens)
+        self._last_prompt_sizes = (persona, instruction, emotional_context, sizes)
+        return sizes
+
+    def _format_summary_and_tokens(
+        self, summary: ConversationSummary
+    ) -> tuple[str, int]:
+        """Format a summary and estimate its tokens.
+
+        Formatting is cheap and always redone, since callers may edit a
+        summary in place; the token estimate is reused while the formatted
+        text stays the same.
+        """
+        text = self._format_summary(summary)
+        last = self._last_summary
+        if last is not None and last[0] == text:
+            return last
+        tokens = self._budget_manager.estimate_tokens(text)
+        self._last_summary = (text, tokens)
+        return text, tokens
+
     def _format_summary(self, summary: ConversationSummary) -> str:
         """Format summary for inclusion in prompt."""
         parts = [f"User intent: {summary.user_intent}"]
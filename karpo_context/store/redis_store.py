@@ -1,15 +1,124 @@
 """Redis-backed implementation of ContextStore."""
 from __future__ import annotations
 
-import json
+import asyncio
 import ssl
-from typing import Any
-
-from redis.asyncio import Redis
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+from weakref import WeakSet
 
 from karpo_context.models import ConversationContext
+from karpo_context.store import codec
 from karpo_context.store.base import ContextStore
 
+if TYPE_CHECKING:
+    from redis.asyncio import ConnectionPool, Redis
+
+
+@dataclass(slots=True)
+class _SharedPool:
+    pool: ConnectionPool
+    # Clients still open on the pool; the last one closed disconnects it
+    clients: WeakSet[Redis] = field(default_factory=WeakSet)
+
+
+# Connection pools shared by clients built from the same URL and options,
+# per event loop: asyncio connections only work on the loop that opened them.
+# Open connections reference their loop, so a weak mapping would never drop
+# an entry; pools of closed loops are pruned when the next client is created.
+_POOLS: dict[asyncio.AbstractEventLoop, dict[tuple[Any, ...], _SharedPool]] = {}
+
+# Redis.from_url options that configure the client rather than its pool
+_CLIENT_KWARGS = ("single_connection_client", "auto_close_connection_pool")
+
+
+def redis_client_from_url(
+    url: str,
+    *,
+    ssl_cert_reqs: str | None = None,
+    **redis_kwargs: Any,
+) -> Redis:
+    """Create an async Redis client from a URL.
+
+    Shared by the ``from_url`` factories of all Redis-backed stores. For
+    ``rediss://`` URLs an SSL context is configured; pass
+    ``ssl_cert_reqs="none"`` to skip certificate verification.
+
+    ``unix://`` URLs connect over a Unix socket, which avoids TCP overhead
+    when Redis runs on the same host. Connections use TCP keepalive and a
+    30 s health check unless overridden. redis-py uses the hiredis parser
+    automatically when it is installed (the ``fast`` extra).
+
+    Clients created on the same running event loop with the same URL and
+    pool options share one connection pool, so stores for several agents
+    reuse the same connections. Called outside a running loop, the client
+    gets a private pool. Close clients with close_redis_client(), which
+    disconnects a shared pool once its last client is closed.
+    """
+    from redis.asyncio import ConnectionPool, Redis
+
+    client_kwargs = {k: redis_kwargs[k] for k in _CLIENT_KWARGS if k in redis_kwargs}
+    pool_options = {k: v for k, v in redis_kwargs.items() if k not in client_kwargs}
+    kwargs: dict[str, Any] = {**pool_options}
+    kwargs.setdefault("health_check_interval", 30)
+    if not url.startswith("unix://"):
+        kwargs.setdefault("socket_keepalive", True)
+
+    if url.startswith("rediss://"):
+        ssl_ctx = ssl.create_default_context()
+        if ssl_cert_reqs == "none":
+            ssl_ctx.check_hostname = False
+            ssl_ctx.verify_mode = ssl.CERT_NONE
+        kwargs.setdefault("ssl", True)
+        kwargs.setdefault("ssl_context", ssl_ctx)
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop to tie a shared pool to
+        return Redis.from_url(url, **kwargs, **client_kwargs)
+    for closed in [other for other in _POOLS if other.is_closed()]:
+        del _POOLS[closed]
+    key = (url, ssl_cert_reqs, tuple(sorted(pool_options.items())))
+    pools = _POOLS.setdefault(loop, {})
+    try:
+        shared = pools.get(key)
+    except TypeError:
+        # Unhashable options: give this client a private pool
+        return Redis.from_url(url, **kwargs, **client_kwargs)
+    if shared is None:
+        shared = pools[key] = _SharedPool(ConnectionPool.from_url(url, **kwargs))
+    client = Redis(connection_pool=shared.pool, **client_kwargs)
+    shared.clients.add(client)
+    return client
+
+
+async def close_redis_client(client: Redis) -> None:
+    """Close a client, and its shared pool if no other client still uses it."""
+    await client.aclose()
+    loop = asyncio.get_running_loop()
+    pools = _POOLS.get(loop, {})
+    for key, shared in pools.items():
+        if shared.pool is client.connection_pool:
+            shared.clients.discard(client)
+            if not shared.clients:
+                del pools[key]
+                if not pools:
+                    del _POOLS[loop]
+                await shared.pool.disconnect()
+            return
+
+
+async def close_all_pools() -> None:
+    """Disconnect and forget the shared connection pools of the running loop.
+
+    Closes connections of clients that were never closed. Call on shutdown,
+    from the loop the stores ran on.
+    """
+    pools = _POOLS.pop(asyncio.get_running_loop(), {})
+    for shared in pools.values():
+        await shared.pool.disconnect()
+
 
 class RedisContextStore(ContextStore):
     """Stores conversation context as JSON strings in Redis."""
@@ -49,24 +158,16 @@ class RedisContextStore(ContextStore):
                 endpoints with self-signed certs). Defaults to ``None``
                 which uses the system default.
             **redis_kwargs: Extra keyword arguments forwarded to
-                ``Redis.from_url()``, e.g. ``password``, ``decode_responses``.
+                ``Redis.from_url()``, e.g. ``password``, ``max_connections``.
+                Leave ``decode_responses`` off; payloads are parsed
+                straight from bytes.
         """
-        kwargs: dict[str, Any] = {**redis_kwargs}
-
-        if url.startswith("rediss://"):
-            ssl_ctx = ssl.create_default_context()
-            if ssl_cert_reqs == "none":
-                ssl_ctx.check_hostname = False
-                ssl_ctx.verify_mode = ssl.CERT_NONE
-            kwargs.setdefault("ssl", True)
-            kwargs.setdefault("ssl_context", ssl_ctx)
-
-        client = Redis.from_url(url, **kwargs)
+        client = redis_client_from_url(url, ssl_cert_reqs=ssl_cert_reqs, **redis_kwargs)
         return cls(client, prefix=prefix, ttl_seconds=ttl_seconds)
 
     async def close(self) -> None:
         """Close the underlying Redis connection."""
-        await self._redis.aclose()
+        await close_redis_client(self._redis)
 
     def _key(self, conversation_id: int) -> str:
         return f"{self._prefix}:{conversation_id}"
@@ -75,13 +176,13 @@ class RedisContextStore(ContextStore):
         raw = await self._redis.get(self._key(conversation_id))
         if raw is None:
             return None
-        data = json.loads(raw)
+        data = codec.loads(raw)
         return ConversationContext.from_dict(data)
 
     async def save(self, context: ConversationContext) -> None:
         key = self._key(context.conversation_id)
-        data = json.dumps(context.to_dict())
+        data = codec.dumps(context.to_dict())
         await self._redis.set(key, data, ex=self._ttl_seconds)
 
     async def delete(self, conversation_id: int) -> None:
-        await self._redis.delete(self._key(conversation_id))
+        await self._redis.unlink(self._key(conversation_id))
@@ -1,21 +1,60 @@
 """Session state storage with Redis backend."""
 from __future__ import annotations
 
-import json
-import ssl
-from typing import Any
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
-from redis.asyncio import Redis
-
-from karpo_context.models import SessionState
+from karpo_context.models import ChatMessage, SessionState
+from karpo_context.store import codec
 from karpo_context.store.base import ContextStore
+from karpo_context.store.redis_store import close_redis_client, redis_client_from_url
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from redis.asyncio.client import Pipeline
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class SessionSnapshot:
+    """Everything stored for one thread, read in a single round-trip."""
+
+    session: SessionState | None
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    summary_backups: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _EncodedTurn:
+    """A turn's writes, encoded up front so they can be sent later."""
+
+    session: SessionState
+    thread_id: int
+    session_data: bytes
+    # Full message history, encoded only if the list has to be rewritten
+    messages: tuple[ChatMessage, ...]
+    # Stored messages to drop from the head; None rewrites the whole list
+    trim: int | None
+    appended: list[bytes]
+    error_data: bytes | None = None
+    backup_data: bytes | None = None
+    # (tool key, encoded result) pairs
+    tool_data: list[tuple[str, bytes]] = field(default_factory=list)
 
 
 class SessionStateStore(ContextStore):
     """Stores SessionState in Redis with agent-specific key namespacing.
 
     Key formats:
-    - Session: ctx:{agent}:session:{thread_id}
+    - Session: ctx:{agent}:session:{thread_id} (everything but messages)
+    - Messages: ctx:{agent}:messages:{thread_id} (list, one per message)
     - Tool result: ctx:{agent}:tool:{thread_id}:{call_id}
     - Errors: ctx:{agent}:errors:{thread_id} (list)
     - Summary backup: ctx:{agent}:summary_backup:{thread_id} (list)
@@ -28,12 +67,27 @@ class SessionStateStore(ContextStore):
         ttl_seconds: int = 7 * 24 * 3600,
         error_max_count: int = 50,
         summary_backup_max_count: int = 20,
+        max_pending_writes: int = 64,
+        tool_result_cache_size: int = 0,
     ) -> None:
         self._redis = redis_client
         self._agent_name = agent_name
         self._ttl_seconds = ttl_seconds
         self._error_max_count = error_max_count
         self._summary_backup_max_count = summary_backup_max_count
+        self._write_slots = asyncio.Semaphore(max_pending_writes)
+        # Latest background turn write per thread; each one waits for its
+        # predecessor, and every other read or write for the thread waits
+        # for it, so writes land in order. This only holds within one store
+        # instance.
+        self._pending_turns: dict[int, asyncio.Task[None]] = {}
+        # Threads whose last turn write failed. Turns queued behind it were
+        # encoded as if it had landed, so they rewrite the message list.
+        self._unsynced_threads: set[int] = set()
+        # Encoded tool results with their expiry, most recently used last.
+        # Each call id is written once, so entries can't go stale.
+        self._tool_result_cache_size = tool_result_cache_size
+        self._tool_results: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
 
     @classmethod
     def from_url(
@@ -44,6 +98,7 @@ class SessionStateStore(ContextStore):
         ttl_seconds: int = 7 * 24 * 3600,
         error_max_count: int = 50,
         summary_backup_max_count: int = 20,
+        tool_result_cache_size: int = 0,
         ssl_cert_reqs: str | None = None,
         **redis_kwargs: Any,
     ) -> SessionStateStore:
@@ -55,35 +110,36 @@ class SessionStateStore(ContextStore):
             ttl_seconds: Time-to-live for stored data.
             error_max_count: Max errors to keep in sliding window.
             summary_backup_max_count: Max summary backups to keep.
+            tool_result_cache_size: Tool results to keep in process (0 disables).
             ssl_cert_reqs: SSL verification mode ("none" to skip).
             **redis_kwargs: Extra args for Redis.from_url().
         """
-        kwargs: dict[str, Any] = {**redis_kwargs}
-
-        if url.startswith("rediss://"):
-            ssl_ctx = ssl.create_default_context()
-            if ssl_cert_reqs == "none":
-                ssl_ctx.check_hostname = False
-                ssl_ctx.verify_mode = ssl.CERT_NONE
-            kwargs.setdefault("ssl", True)
-            kwargs.setdefault("ssl_context", ssl_ctx)
-
-        client = Redis.from_url(url, **kwargs)
+        client = redis_client_from_url(url, ssl_cert_reqs=ssl_cert_reqs, **redis_kwargs)
         return cls(
             client,
             agent_name=agent_name,
             ttl_seconds=ttl_seconds,
             error_max_count=error_max_count,
             summary_backup_max_count=summary_backup_max_count,
+            tool_result_cache_size=tool_result_cache_size,
         )
 
     async def close(self) -> None:
-        """Close the underlying Redis connection."""
-        await self._redis.aclose()
+        """Flush background writes and close the Redis connection."""
+        await self.drain()
+        await close_redis_client(self._redis)
+
+    async def drain(self) -> None:
+        """Wait until all background turn writes have finished."""
+        while self._pending_turns:
+            await asyncio.wait(list(self._pending_turns.values()))
 
     def _session_key(self, thread_id: int) -> str:
         return f"ctx:{self._agent_name}:session:{thread_id}"
 
+    def _messages_key(self, thread_id: int) -> str:
+        return f"ctx:{self._agent_name}:messages:{thread_id}"
+
     def _tool_key(self, thread_id: int, call_id: str) -> str:
         return f"ctx:{self._agent_name}:tool:{thread_id}:{call_id}"
 
@@ -95,59 +151,438 @@ class SessionStateStore(ContextStore):
 
     async def get(self, thread_id: int) -> SessionState | None:
         """Get session state by thread ID."""
-        raw = await self._redis.get(self._session_key(thread_id))
-        if raw is None:
-            return None
-        data = json.loads(raw)
-        return SessionState.from_dict(data)
+        await self._wait_for_pending_turn(thread_id)
+        # MULTI, so a concurrent write can't land between the two reads and
+        # pair one turn's metadata with another turn's messages
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.get(self._session_key(thread_id))
+            pipe.lrange(self._messages_key(thread_id), 0, -1)
+            raw, raw_messages = await pipe.execute()
+        return None if raw is None else self._decode_session(raw, raw_messages)
+
+    async def get_many(self, thread_ids: list[int]) -> list[SessionState | None]:
+        """Get several sessions in one round-trip, in the order given."""
+        for thread_id in thread_ids:
+            await self._wait_for_pending_turn(thread_id)
+        if not thread_ids:
+            return []
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for thread_id in thread_ids:
+                pipe.get(self._session_key(thread_id))
+                pipe.lrange(self._messages_key(thread_id), 0, -1)
+            replies = await pipe.execute()
+        return [
+            None if raw is None else self._decode_session(raw, raw_messages)
+            for raw, raw_messages in zip(replies[::2], replies[1::2])
+        ]
+
+    async def get_snapshot(self, thread_id: int) -> SessionSnapshot:
+        """Get the session, errors and summary backups in one round-trip."""
+        await self._wait_for_pending_turn(thread_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.get(self._session_key(thread_id))
+            pipe.lrange(self._messages_key(thread_id), 0, -1)
+            pipe.lrange(self._errors_key(thread_id), 0, -1)
+            pipe.lrange(self._summary_backup_key(thread_id), 0, -1)
+            raw, raw_messages, raw_errors, raw_backups = await pipe.execute()
+        return SessionSnapshot(
+            session=None if raw is None else self._decode_session(raw, raw_messages),
+            errors=[codec.loads(item) for item in raw_errors],
+            summary_backups=[codec.loads(item) for item in raw_backups],
+        )
+
+    async def get_and_touch(self, thread_id: int) -> SessionState | None:
+        """Get session state and refresh its TTL in the same round-trip.
+
+        Requires Redis >= 6.2 for GETEX. GETEX and EXPIRE on missing keys
+        create nothing, so cold misses cost nothing extra.
+        """
+        await self._wait_for_pending_turn(thread_id)
+        messages_key = self._messages_key(thread_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.getex(self._session_key(thread_id), ex=self._ttl_seconds)
+            pipe.lrange(messages_key, 0, -1)
+            pipe.expire(messages_key, self._ttl_seconds)
+            raw, raw_messages, _ = await pipe.execute()
+        return None if raw is None else self._decode_session(raw, raw_messages)
 
     async def save(self, session: SessionState) -> None:
-        """Save session state."""
-        key = self._session_key(session.thread_id)
-        data = json.dumps(session.to_dict())
-        await self._redis.set(key, data, ex=self._ttl_seconds)
+        """Save session state.
+
+        A session unchanged since it was loaded from or last saved to this
+        store only has its TTL refreshed, unless its keys are gone (deleted
+        or expired), in which case it is written in full.
+        """
+        await self._wait_for_pending_turn(session.thread_id)
+        if (
+            not session.dirty
+            and not self._has_unsaved_changes(session)
+            and await self._touch_stored(session)
+        ):
+            return
+        await self._write_turn(self._encode_turn(session, None, None, None))
+
+    def _has_unsaved_changes(self, session: SessionState) -> bool:
+        """Catch in-place list edits, which don't mark the session dirty."""
+        if session._stored_in is not self:
+            return True
+        if tuple(session.messages) != session._stored_messages:
+            return True
+        meta = codec.dumps(session.to_dict(include_messages=False))
+        return meta != session._stored_meta
+
+    async def _touch_stored(self, session: SessionState) -> bool:
+        """Refresh the TTL of a stored session; False if its keys are gone."""
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.expire(self._session_key(session.thread_id), self._ttl_seconds)
+            pipe.expire(self._messages_key(session.thread_id), self._ttl_seconds)
+            meta_found, messages_found = await pipe.execute()
+        if meta_found and (messages_found or not session.messages):
+            return True
+        session._stored_messages = None
+        return False
+
+    async def commit_turn(
+        self,
+        session: SessionState,
+        *,
+        error: dict[str, Any] | None = None,
+        summary_backup: dict[str, Any] | None = None,
+        tool_results: dict[str, Any] | None = None,
+    ) -> None:
+        """Save session state together with the turn's other writes.
+
+        ``error`` and ``summary_backup`` go to their sliding windows and
+        ``tool_results`` (call ID -> result) are saved as by
+        save_tool_result. All writes for the end of a turn are sent in a
+        single pipeline, costing one round-trip regardless of how many are
+        queued. Only messages added since the session was loaded or last
+        written are encoded and pushed.
+        """
+        await self._wait_for_pending_turn(session.thread_id)
+        await self._write_turn(
+            self._encode_turn(session, error, summary_backup, tool_results)
+        )
+
+    async def commit_turn_in_background(
+        self,
+        session: SessionState,
+        *,
+        error: dict[str, Any] | None = None,
+        summary_backup: dict[str, Any] | None = None,
+        tool_results: dict[str, Any] | None = None,
+    ) -> None:
+        """Like commit_turn, but return before the write reaches Redis.
+
+        The payload is encoded immediately, so later changes to the session
+        are not picked up. Reads for the same thread wait for the write to
+        land, and at most ``max_pending_writes`` writes are in flight; past
+        that, this waits for a slot. Failures are logged, not raised. Call
+        drain() or close() on shutdown.
+
+        Other reads and writes wait only for writes queued on this store
+        instance, so share one store per process for a given agent.
+        """
+        encoded = self._encode_turn(session, error, summary_backup, tool_results)
+        await self._schedule_write(
+            encoded.thread_id, partial(self._write_turn, encoded)
+        )
+
+    async def _schedule_write(
+        self, thread_id: int, write: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Run ``write`` in the background after the thread's pending writes."""
+        await self._write_slots.acquire()
+        task = asyncio.create_task(
+            self._write_after(self._pending_turns.get(thread_id), write)
+        )
+        self._pending_turns[thread_id] = task
+        task.add_done_callback(partial(self._background_write_done, thread_id))
+
+    def _decode_session(self, raw: bytes, raw_messages: list[bytes]) -> SessionState:
+        data = codec.loads(raw)
+        # Sessions written before messages moved to their own list still
+        # carry them inline; those are rewritten in full on the next save.
+        legacy = "messages" in data
+        if not legacy:
+            data["messages"] = list(map(codec.loads, raw_messages))
+        session = SessionState.from_dict(data)
+        if not legacy:
+            session._stored_messages = tuple(session.messages)
+            session._stored_meta = raw
+            session._stored_in = self
+        session.mark_clean()
+        return session
+
+    @staticmethod
+    def _stored_head_to_drop(
+        stored: tuple[ChatMessage, ...] | None,
+        current: tuple[ChatMessage, ...],
+    ) -> int | None:
+        """How many stored messages to drop so that appending the rest of
+        ``current`` reproduces it, or None if the list must be rewritten.
+
+        Messages are compared by identity: appending and dropping from the
+        front (compression) are cheap, any other edit rewrites the list.
+        """
+        if stored is None:
+            return None
+        if not stored or not current:
+            return len(stored)
+        first = current[0]
+        for dropped, msg in enumerate(stored):
+            if msg is first:
+                break
+        else:
+            return None
+        kept = stored[dropped:]
+        if len(current) < len(kept) or any(
+            a is not b for a, b in zip(kept, current)
+        ):
+            return None
+        return dropped
+
+    def _encode_turn(
+        self,
+        session: SessionState,
+        error: dict[str, Any] | None,
+        summary_backup: dict[str, Any] | None,
+        tool_results: dict[str, Any] | None,
+    ) -> _EncodedTurn:
+        messages = tuple(session.messages)
+        stored = session._stored_messages if session._stored_in is self else None
+        trim = self._stored_head_to_drop(stored, messages)
+        new_messages = messages if trim is None else messages[
+            len(stored) - trim :
+        ]
+        encoded = _EncodedTurn(
+            session=session,
+            thread_id=session.thread_id,
+            session_data=codec.dumps(session.to_dict(include_messages=False)),
+            messages=messages,
+            trim=trim,
+            appended=[codec.dumps(m.to_dict()) for m in new_messages],
+            error_data=None if error is None else codec.dumps(error),
+            backup_data=None if summary_backup is None else codec.dumps(summary_backup),
+        )
+        if tool_results:
+            thread_id = session.thread_id
+            encoded.tool_data = [
+                (self._tool_key(thread_id, call_id), codec.dumps(result))
+                for call_id, result in tool_results.items()
+            ]
+        # The payload is captured, so the session matches what gets written;
+        # _write_turn undoes this if the write fails
+        session._stored_messages = messages
+        session._stored_meta = encoded.session_data
+        session._stored_in = self
+        session.mark_clean()
+        return encoded
+
+    async def _write_turn(self, turn: _EncodedTurn) -> None:
+        try:
+            await self._send_turn(turn)
+        except BaseException:
+            # Nothing is known to be stored any more: the next save writes
+            # everything, and rewrites the message list
+            self._unsynced_threads.add(turn.thread_id)
+            session = turn.session
+            session._stored_messages = None
+            session._stored_meta = None
+            session._stored_in = None
+            session.mark_dirty()
+            raise
+        self._unsynced_threads.discard(turn.thread_id)
+
+    async def _send_turn(self, turn: _EncodedTurn) -> None:
+        thread_id = turn.thread_id
+        messages_key = self._messages_key(thread_id)
+        trim, appended = turn.trim, turn.appended
+        if trim is not None and thread_id in self._unsynced_threads:
+            # The list may not hold what this turn was encoded against, and
+            # a matching length wouldn't prove otherwise
+            trim = None
+            appended = [codec.dumps(m.to_dict()) for m in turn.messages]
+        # MULTI keeps the trim, push and length check together, so the
+        # length seen is the one these commands produced
+        async with self._redis.pipeline(transaction=True) as pipe:
+            if trim is None:
+                pipe.unlink(messages_key)
+            elif trim:
+                pipe.ltrim(messages_key, trim, -1)
+            if appended:
+                pipe.rpush(messages_key, *appended)
+            pipe.llen(messages_key)
+            pipe.expire(messages_key, self._ttl_seconds)
+            pipe.set(self._session_key(thread_id), turn.session_data, ex=self._ttl_seconds)
+            if turn.error_data is not None:
+                self._queue_window_push(
+                    pipe, self._errors_key(thread_id), turn.error_data, self._error_max_count
+                )
+            if turn.backup_data is not None:
+                self._queue_window_push(
+                    pipe,
+                    self._summary_backup_key(thread_id),
+                    turn.backup_data,
+                    self._summary_backup_max_count,
+                )
+            for tool_key, tool_data in turn.tool_data:
+                pipe.set(tool_key, tool_data, ex=self._ttl_seconds)
+            results = await pipe.execute()
+        for tool_key, tool_data in turn.tool_data:
+            self._cache_tool_result(tool_key, tool_data, self._ttl_seconds)
+        length = results[(trim is None or trim > 0) + bool(appended)]
+        if length != len(turn.messages):
+            # The list no longer matched what this session last saw (it
+            # expired, or another writer touched it); rewrite it whole.
+            await self._rewrite_messages(messages_key, turn.messages)
+
+    async def _rewrite_messages(
+        self, key: str, messages: tuple[ChatMessage, ...]
+    ) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.unlink(key)
+            if messages:
+                pipe.rpush(key, *(codec.dumps(m.to_dict()) for m in messages))
+                pipe.expire(key, self._ttl_seconds)
+            await pipe.execute()
+
+    @staticmethod
+    async def _write_after(
+        previous: asyncio.Task[None] | None, write: Callable[[], Awaitable[None]]
+    ) -> None:
+        if previous is not None:
+            await asyncio.wait((previous,))
+        await write()
+
+    def _background_write_done(self, thread_id: int, task: asyncio.Task[None]) -> None:
+        self._write_slots.release()
+        if self._pending_turns.get(thread_id) is task:
+            del self._pending_turns[thread_id]
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            logger.error(
+                "Background session write failed for thread %s",
+                thread_id,
+                exc_info=exc,
+            )
+
+    async def _wait_for_pending_turn(self, thread_id: int) -> None:
+        task = self._pending_turns.get(thread_id)
+        if task is not None:
+            await asyncio.wait((task,))
 
     async def delete(self, thread_id: int) -> None:
-        """Delete session state."""
-        await self._redis.delete(self._session_key(thread_id))
+        """Delete session state.
+
+        Uses UNLINK, so Redis frees a long message list off its main thread.
+        """
+        await self._wait_for_pending_turn(thread_id)
+        await self._redis.unlink(
+            self._session_key(thread_id), self._messages_key(thread_id)
+        )
 
     async def save_tool_result(
-        self, thread_id: int, call_id: str, result: Any
+        self,
+        thread_id: int,
+        call_id: str,
+        result: Any,
+        *,
+        ttl_seconds: int | None = None,
     ) -> None:
         """Save a tool call result for later retrieval.
 
         Used for offloading large tool results (>500 tokens) from
-        the main session to reduce context size.
+        the main session to reduce context size. ``ttl_seconds`` overrides
+        the store's TTL for this result, e.g. to let bulky results of
+        one-shot lookups expire sooner than the session.
         """
+        if ttl_seconds is None:
+            ttl_seconds = self._ttl_seconds
         key = self._tool_key(thread_id, call_id)
-        data = json.dumps(result)
-        await self._redis.set(key, data, ex=self._ttl_seconds)
+        data = codec.dumps(result)
+        await self._wait_for_pending_turn(thread_id)
+        await self._redis.set(key, data, ex=ttl_seconds)
+        self._cache_tool_result(key, data, ttl_seconds)
 
     async def get_tool_result(self, thread_id: int, call_id: str) -> Any | None:
-        """Get a stored tool result."""
-        raw = await self._redis.get(self._tool_key(thread_id, call_id))
+        """Get a stored tool result.
+
+        With ``tool_result_cache_size`` set, recently saved or read results
+        are served from process memory without a Redis round-trip. Each
+        call decodes a fresh copy, so callers may mutate what they get.
+        """
+        await self._wait_for_pending_turn(thread_id)
+        key = self._tool_key(thread_id, call_id)
+        if self._tool_result_cache_size <= 0:
+            raw = await self._redis.get(key)
+            return None if raw is None else codec.loads(raw)
+        raw = self._cached_tool_result(key)
         if raw is None:
+            # The result may have been saved with its own ttl_seconds, so
+            # cache it only for as long as Redis keeps it
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                raw, ttl_ms = await pipe.execute()
+            if raw is None:
+                return None
+            ttl_seconds = self._ttl_seconds if ttl_ms < 0 else ttl_ms / 1000
+            self._cache_tool_result(key, raw, ttl_seconds)
+        return codec.loads(raw)
+
+    def _cached_tool_result(self, key: str) -> bytes | None:
+        entry = self._tool_results.get(key)
+        if entry is None:
+            return None
+        expires_at, raw = entry
+        if expires_at <= time.monotonic():
+            del self._tool_results[key]
             return None
-        return json.loads(raw)
+        self._tool_results.move_to_end(key)
+        return raw
+
+    def _cache_tool_result(self, key: str, raw: bytes, ttl_seconds: float) -> None:
+        if self._tool_result_cache_size <= 0:
+            return
+        self._tool_results[key] = (time.monotonic() + ttl_seconds, raw)
+        self._tool_results.move_to_end(key)
+        if len(self._tool_results) > self._tool_result_cache_size:
+            self._tool_results.popitem(last=False)
 
     async def append_error(self, thread_id: int, error: dict[str, Any]) -> None:
         """Append an error to the error notebook (sliding window).
 
         Maintains a sliding window of the most recent errors.
         """
-        key = self._errors_key(thread_id)
-        data = json.dumps(error)
-        async with self._redis.pipeline() as pipe:
-            pipe.rpush(key, data)
-            pipe.ltrim(key, -self._error_max_count, -1)
-            pipe.expire(key, self._ttl_seconds)
-            await pipe.execute()
+        await self._wait_for_pending_turn(thread_id)
+        await self._window_push(
+            self._errors_key(thread_id), codec.dumps(error), self._error_max_count
+        )
+
+    async def append_error_in_background(
+        self, thread_id: int, error: dict[str, Any]
+    ) -> None:
+        """Like append_error, but return before the write reaches Redis.
+
+        Ordered and bounded like commit_turn_in_background; reads for the
+        thread wait for it, and failures are logged, not raised.
+        """
+        await self._schedule_write(
+            thread_id,
+            partial(
+                self._window_push,
+                self._errors_key(thread_id),
+                codec.dumps(error),
+                self._error_max_count,
+            ),
+        )
 
     async def get_errors(self, thread_id: int) -> list[dict[str, Any]]:
         """Get all errors from the error notebook."""
+        await self._wait_for_pending_turn(thread_id)
         key = self._errors_key(thread_id)
         raw_list = await self._redis.lrange(key, 0, -1)
-        return [json.loads(item) for item in raw_list]
+        return [codec.loads(item) for item in raw_list]
 
     async def save_summary_backup(
         self, thread_id: int, backup: dict[str, Any]
@@ -157,16 +592,43 @@ class SessionStateStore(ContextStore):
         Used to store original messages when generating summaries,
         allowing retrospection if needed.
         """
-        key = self._summary_backup_key(thread_id)
-        data = json.dumps(backup)
-        async with self._redis.pipeline() as pipe:
-            pipe.rpush(key, data)
-            pipe.ltrim(key, -self._summary_backup_max_count, -1)
-            pipe.expire(key, self._ttl_seconds)
-            await pipe.execute()
+        await self._wait_for_pending_turn(thread_id)
+        await self._window_push(
+            self._summary_backup_key(thread_id),
+            codec.dumps(backup),
+            self._summary_backup_max_count,
+        )
+
+    async def save_summary_backup_in_background(
+        self, thread_id: int, backup: dict[str, Any]
+    ) -> None:
+        """Like save_summary_backup, but return before the write reaches Redis."""
+        await self._schedule_write(
+            thread_id,
+            partial(
+                self._window_push,
+                self._summary_backup_key(thread_id),
+                codec.dumps(backup),
+                self._summary_backup_max_count,
+            ),
+        )
 
     async def get_summary_backups(self, thread_id: int) -> list[dict[str, Any]]:
         """Get all summary backups."""
+        await self._wait_for_pending_turn(thread_id)
         key = self._summary_backup_key(thread_id)
         raw_list = await self._redis.lrange(key, 0, -1)
-        return [json.loads(item) for item in raw_list]
+        return [codec.loads(item) for item in raw_list]
+
+    async def _window_push(self, key: str, data: bytes, max_count: int) -> None:
+        async with self._redis.pipeline() as pipe:
+            self._queue_window_push(pipe, key, data, max_count)
+            await pipe.execute()
+
+    def _queue_window_push(
+        self, pipe: Pipeline, key: str, data: bytes, max_count: int
+    ) -> None:
+        """Queue a sliding-window append (RPUSH + LTRIM + EXPIRE) on a pipeline."""
+        pipe.rpush(key, data)
+        pipe.ltrim(key, -max_count, -1)
+        pipe.expire(key, self._ttl_seconds)
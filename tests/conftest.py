@@ -0,0 +1,44 @@
+"""Shared test fixtures."""
+from datetime import datetime, timezone
+from functools import cache
+
+import fakeredis.aioredis
+import pytest
+
+from karpo_context.models import ChatMessage
+
+
+@pytest.fixture(scope="session")
+def now():
+    """A fixed timestamp shared by all tests."""
+    return datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="session")
+def msgs_factory(now):
+    """Build user messages ``msg0``..``msg{n-1}``, cached per ``n``.
+
+    Messages are immutable, so the cached tuples are safe to share;
+    wrap in ``list()`` before handing them to a context.
+    """
+
+    @cache
+    def build(n: int) -> tuple[ChatMessage, ...]:
+        return tuple(
+            ChatMessage(role="user", content=f"msg{i}", created_at=now)
+            for i in range(n)
+        )
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def _shared_redis_client():
+    return fakeredis.aioredis.FakeRedis()
+
+
+@pytest.fixture
+async def redis_client(_shared_redis_client):
+    """One FakeRedis for the whole session, flushed after each test."""
+    yield _shared_redis_client
+    await _shared_redis_client.flushdb()
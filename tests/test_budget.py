@@ -1,7 +1,10 @@
 """Tests for TokenBudgetManager."""
+import dataclasses
 
+import pytest
 
-from karpo_context.budget import TokenBudgetManager, ContextBudget
+from karpo_context.budget import BudgetCheck, TokenBudgetManager, ContextBudget
+from karpo_context.models import ChatMessage
 
 
 class TestContextBudget:
@@ -32,6 +35,13 @@ class TestContextBudget:
         assert budget.persona_prompt == 2000
         assert budget.recent_history == 8000
 
+    def test_budget_is_frozen(self):
+        """Test budget cannot be mutated after construction."""
+        budget = ContextBudget()
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            budget.total_limit = 16000
+
 
 class TestTokenBudgetManager:
     """Tests for TokenBudgetManager."""
@@ -92,6 +102,56 @@ class TestTokenBudgetManager:
 
         assert tokens == 2
 
+    def test_estimate_tokens_ignores_non_cjk_multibyte(self):
+        """Test that non-CJK multibyte characters count as English."""
+        manager = TokenBudgetManager()
+
+        # Accented Latin and emoji are not Chinese characters
+        text = "café ☕ naïve"  # 12 chars, 0 Chinese
+        tokens = manager.estimate_tokens(text)
+
+        # 12 / 4 = 3
+        assert tokens == 3
+
+    def test_count_chinese_numpy_matches_byte_scan(self, monkeypatch):
+        """Test the numpy path counts the same range as the byte scan."""
+        pytest.importorskip("numpy")
+        from karpo_context import budget
+
+        text = "帮我规划东京5日游, please plan a trip. 䀀 café " * 40
+        assert len(text) >= budget._NUMPY_MIN_CHARS
+
+        vectorized = budget._count_chinese(text)
+        monkeypatch.setattr(budget, "np", None)
+        assert budget._count_chinese(text) == vectorized
+
+    def test_estimate_tokens_cached(self):
+        """Test repeated estimates are served from the cache."""
+        from karpo_context.budget import _estimate_tokens_cached
+
+        manager = TokenBudgetManager()
+        manager.cache_clear()
+
+        manager.estimate_tokens("You are a travel agent.")
+        manager.estimate_tokens("You are a travel agent.")
+
+        info = _estimate_tokens_cached.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+        manager.cache_clear()
+        assert _estimate_tokens_cached.cache_info().currsize == 0
+
+    def test_estimate_tokens_bulk(self):
+        """Test bulk estimation matches per-text estimation."""
+        manager = TokenBudgetManager()
+
+        texts = ["Hello world", "你好世界", "", None, "Hello 你好"]
+        tokens = manager.estimate_tokens_bulk(texts)
+
+        assert tokens == [manager.estimate_tokens(t) for t in texts]
+        assert tokens == [2, 2, 0, 0, 2]
+
     def test_estimate_messages_tokens(self):
         """Test token estimation for message list."""
         manager = TokenBudgetManager()
@@ -105,12 +165,74 @@ class TestTokenBudgetManager:
         # (1 + 4) + (2 + 4) = 11
         assert tokens == 11
 
+    def test_estimate_messages_tokens_tool_overhead(self):
+        """Test tool messages carry extra overhead for their call id."""
+        manager = TokenBudgetManager()
+
+        messages = [
+            {"role": "tool", "content": "Hello"},  # 5 chars -> 1 token + 8 overhead
+            {"content": "Hi there!"},  # No role -> default 4 overhead
+        ]
+        tokens = manager.estimate_messages_tokens(messages)
+
+        # 14 chars -> 3 tokens, + 8 + 4
+        assert tokens == 15
+
+    def test_chat_messages_match_dict_messages(self, now):
+        """Test ChatMessage-based estimates match the dict-based ones."""
+        chat_messages = [
+            ChatMessage(role="user", content="帮我规划东京5日游", created_at=now),
+            ChatMessage(role="assistant", content=None, created_at=now),
+            ChatMessage(role="tool", content='{"ok": true}', created_at=now),
+        ]
+        dict_messages = [
+            {"role": m.role, "content": m.content or ""} for m in chat_messages
+        ]
+
+        manager = TokenBudgetManager()
+        assert manager.estimate_chat_messages_tokens(
+            chat_messages
+        ) == manager.estimate_messages_tokens(dict_messages)
+        for limit in (0, 10, 20, 100):
+            assert manager.trim_chat_messages_start(
+                chat_messages, limit
+            ) == manager.trim_messages_start(dict_messages, limit)
+
     def test_estimate_messages_tokens_empty(self):
         """Test token estimation for empty message list."""
         manager = TokenBudgetManager()
 
         assert manager.estimate_messages_tokens([]) == 0
 
+    def test_trim_messages_start_matches_estimate(self):
+        """Test trimming keeps the longest suffix that fits the limit."""
+        manager = TokenBudgetManager()
+
+        messages = [
+            {"role": "user", "content": "帮我规划东京5日游"},
+            {"role": "assistant", "content": "When do you want to leave?"},
+            {"role": "tool", "content": '{"flights": []}'},
+            {"role": "user", "content": "三月初 please"},
+        ]
+        for limit in range(60):
+            start = manager.trim_messages_start(messages, limit)
+            # Oldest-first trimming: drop the fewest messages that fit
+            expected = next(
+                (
+                    i
+                    for i in range(len(messages))
+                    if manager.estimate_messages_tokens(messages[i:]) <= limit
+                ),
+                len(messages),
+            )
+            assert start == expected
+
+    def test_trim_messages_start_empty(self):
+        """Test trimming an empty message list."""
+        manager = TokenBudgetManager()
+
+        assert manager.trim_messages_start([], 100) == 0
+
     def test_check_budget_all_within(self):
         """Test budget check when all components are within limits."""
         manager = TokenBudgetManager()
@@ -124,15 +246,16 @@ class TestTokenBudgetManager:
             input_tokens=200,
         )
 
-        assert result["persona"] is True
-        assert result["instruction"] is True
-        assert result["emotional"] is True
-        assert result["summary"] is True
-        assert result["history"] is True
-        assert result["input"] is True
-        assert result["total"] is True
-        assert result["total_used"] == 3150
-        assert result["total_available"] == 6600  # 8000 - 1400
+        assert isinstance(result, BudgetCheck)
+        assert result.persona is True
+        assert result.instruction is True
+        assert result.emotional is True
+        assert result.summary is True
+        assert result.history is True
+        assert result.input is True
+        assert result.total is True
+        assert result.total_used == 3150
+        assert result.total_available == 6600  # 8000 - 1400
 
     def test_check_budget_exceeding(self):
         """Test budget check when components exceed limits."""
@@ -147,10 +270,10 @@ class TestTokenBudgetManager:
             input_tokens=200,
         )
 
-        assert result["persona"] is False
-        assert result["emotional"] is False
-        assert result["history"] is False
-        assert result["total"] is False  # Total exceeds available
+        assert result.persona is False
+        assert result.emotional is False
+        assert result.history is False
+        assert result.total is False  # Total exceeds available
 
     def test_calculate_degradation_level_normal(self):
         """Test degradation level for normal usage."""
@@ -184,6 +307,17 @@ class TestTokenBudgetManager:
         level = manager.calculate_degradation_level(7000)
         assert level == 3
 
+    def test_calculate_degradation_level_boundaries(self):
+        """Test degradation thresholds are inclusive at 70%, 85% and 100%."""
+        manager = TokenBudgetManager()
+
+        assert manager.calculate_degradation_level(4620) == 0
+        assert manager.calculate_degradation_level(4621) == 1
+        assert manager.calculate_degradation_level(5610) == 1
+        assert manager.calculate_degradation_level(5611) == 2
+        assert manager.calculate_degradation_level(6600) == 2
+        assert manager.calculate_degradation_level(6601) == 3
+
     def test_get_remaining_for_history(self):
         """Test calculating remaining budget for history."""
         manager = TokenBudgetManager()
@@ -242,3 +376,16 @@ class TestTokenBudgetManager:
 
         # Below token threshold but above turn threshold
         assert manager.should_trigger_summary(4000, turn_count=25, threshold=20) is True
+
+    def test_should_trigger_summary_matches_ratio(self):
+        """Token trigger agrees with predict_next_turn_ratio() > 0.7."""
+        for total, buffer in [(8000, 1400), (1000, 0), (4000, 600), (10, 0), (100, 100)]:
+            manager = TokenBudgetManager(
+                budget=ContextBudget(total_limit=total, output_buffer=buffer)
+            )
+            for tokens in range(total + 2):
+                expected = manager.predict_next_turn_ratio(tokens) > 0.7
+                assert (
+                    manager.should_trigger_summary(tokens, turn_count=0, threshold=1)
+                    is expected
+                )
@@ -0,0 +1,17 @@
+"""Tests for karpo_context.store.codec JSON encoding."""
+from karpo_context.store import codec
+
+
+class TestCodec:
+    def test_dumps_returns_bytes(self):
+        assert isinstance(codec.dumps({"a": 1}), bytes)
+
+    def test_roundtrip(self):
+        data = {"role": "user", "content": "你好", "tool_calls": [{"id": "1"}]}
+        assert codec.loads(codec.dumps(data)) == data
+
+    def test_loads_accepts_str(self):
+        assert codec.loads('{"a": [1, 2]}') == {"a": [1, 2]}
+
+    def test_non_str_keys_become_strings(self):
+        assert codec.loads(codec.dumps({1: "one"})) == {"1": "one"}
@@ -1,113 +1,86 @@
 """Tests for karpo_context.compaction layer."""
-from datetime import datetime, timezone
 from unittest.mock import AsyncMock
 
 import pytest
 
+from karpo_context.compaction.base import CompactionTrigger, Summarizer
+from karpo_context.compaction.message_count import MessageCountTrigger
+from karpo_context.compaction.summarizer import LLMSummarizer
+from karpo_context.models import ChatMessage, ConversationContext
+
 
 class TestCompactionTriggerABC:
     def test_cannot_instantiate(self):
-        from karpo_context.compaction.base import CompactionTrigger
-
         with pytest.raises(TypeError):
             CompactionTrigger()
 
     def test_has_should_compact_method(self):
-        from karpo_context.compaction.base import CompactionTrigger
-
         assert hasattr(CompactionTrigger, "should_compact")
 
 
 class TestSummarizerABC:
     def test_cannot_instantiate(self):
-        from karpo_context.compaction.base import Summarizer
-
         with pytest.raises(TypeError):
             Summarizer()
 
     def test_has_summarize_method(self):
-        from karpo_context.compaction.base import Summarizer
-
         assert hasattr(Summarizer, "summarize")
 
 
 class TestMessageCountTrigger:
     def test_is_subclass(self):
-        from karpo_context.compaction.base import CompactionTrigger
-        from karpo_context.compaction.message_count import MessageCountTrigger
-
         assert issubclass(MessageCountTrigger, CompactionTrigger)
 
-    def test_no_compact_below_threshold(self):
-        from karpo_context.compaction.message_count import MessageCountTrigger
-        from karpo_context.models import ChatMessage, ConversationContext
-
-        now = datetime.now(timezone.utc)
+    def test_no_compact_below_threshold(self, now, msgs_factory):
         trigger = MessageCountTrigger(threshold=5)
         ctx = ConversationContext(
             conversation_id=1,
-            messages=[
-                ChatMessage(role="user", content=f"msg{i}", created_at=now)
-                for i in range(3)
-            ],
+            messages=list(msgs_factory(3)),
             created_at=now,
             updated_at=now,
         )
         assert trigger.should_compact(ctx) is False
 
-    def test_compact_above_threshold(self):
-        from karpo_context.compaction.message_count import MessageCountTrigger
-        from karpo_context.models import ChatMessage, ConversationContext
-
-        now = datetime.now(timezone.utc)
+    def test_compact_above_threshold(self, now, msgs_factory):
         trigger = MessageCountTrigger(threshold=5)
         ctx = ConversationContext(
             conversation_id=1,
-            messages=[
-                ChatMessage(role="user", content=f"msg{i}", created_at=now)
-                for i in range(8)
-            ],
+            messages=list(msgs_factory(8)),
             created_at=now,
             updated_at=now,
         )
         assert trigger.should_compact(ctx) is True
 
-    def test_not_at_exactly_threshold(self):
-        from karpo_context.compaction.message_count import MessageCountTrigger
-        from karpo_context.models import ChatMessage, ConversationContext
+    def test_not_at_exactly_threshold(self, now, msgs_factory):
+        trigger = MessageCountTrigger(threshold=5)
+        ctx = ConversationContext(
+            conversation_id=1,
+            messages=list(msgs_factory(5)),
+            created_at=now,
+            updated_at=now,
+        )
+        assert trigger.should_compact(ctx) is False
 
-        now = datetime.now(timezone.utc)
+    def test_ignores_message_count_above_list_length(self, now):
         trigger = MessageCountTrigger(threshold=5)
         ctx = ConversationContext(
             conversation_id=1,
-            messages=[
-                ChatMessage(role="user", content=f"msg{i}", created_at=now)
-                for i in range(5)
-            ],
             created_at=now,
             updated_at=now,
+            message_count=8,
         )
         assert trigger.should_compact(ctx) is False
 
     def test_default_threshold_is_50(self):
-        from karpo_context.compaction.message_count import MessageCountTrigger
-
         trigger = MessageCountTrigger()
         assert trigger._threshold == 50
 
 
 class TestLLMSummarizer:
     def test_is_subclass(self):
-        from karpo_context.compaction.base import Summarizer
-        from karpo_context.compaction.summarizer import LLMSummarizer
-
         assert issubclass(LLMSummarizer, Summarizer)
 
-    async def test_summarize_without_existing_summary(self):
-        from karpo_context.compaction.summarizer import LLMSummarizer
-        from karpo_context.models import ChatMessage
-
-        now = datetime.now(timezone.utc)
+    async def test_summarize_without_existing_summary(self, now):
         llm = AsyncMock(return_value="Summary of the conversation.")
         summarizer = LLMSummarizer(llm_callable=llm)
 
@@ -122,11 +95,7 @@ class TestLLMSummarizer:
         prompt = llm.call_args[0][0]
         assert "Previous summary" not in prompt
 
-    async def test_summarize_with_existing_summary(self):
-        from karpo_context.compaction.summarizer import LLMSummarizer
-        from karpo_context.models import ChatMessage
-
-        now = datetime.now(timezone.utc)
+    async def test_summarize_with_existing_summary(self, now):
         llm = AsyncMock(return_value="Updated summary.")
         summarizer = LLMSummarizer(llm_callable=llm)
 
@@ -138,11 +107,7 @@ class TestLLMSummarizer:
         prompt = llm.call_args[0][0]
         assert "Old summary." in prompt
 
-    async def test_custom_prompt_template(self):
-        from karpo_context.compaction.summarizer import LLMSummarizer
-        from karpo_context.models import ChatMessage
-
-        now = datetime.now(timezone.utc)
+    async def test_custom_prompt_template(self, now):
         llm = AsyncMock(return_value="Custom summary.")
         template = "Custom template. Messages:\n{messages}"
         summarizer = LLMSummarizer(llm_callable=llm, prompt_template=template)
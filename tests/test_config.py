@@ -1,14 +1,14 @@
 """Tests for ContextConfig and presets."""
+import pytest
 
 from karpo_context.budget import ContextBudget
+from karpo_context.config import CONTEXT_CONFIGS, ContextConfig, get_config
 
 
 class TestContextConfig:
     """Tests for ContextConfig dataclass."""
 
     def test_create_default_config(self):
-        from karpo_context.config import ContextConfig
-
         config = ContextConfig()
         assert config.budget is not None
         assert config.summary_trigger_threshold == 20
@@ -16,8 +16,6 @@ class TestContextConfig:
         assert config.enable_proactive_summary is True
 
     def test_create_custom_config(self):
-        from karpo_context.config import ContextConfig
-
         budget = ContextBudget(total_limit=16000)
         config = ContextConfig(
             budget=budget,
@@ -31,15 +29,11 @@ class TestContextConfig:
         assert config.enable_proactive_summary is False
 
     def test_config_has_sliding_window_settings(self):
-        from karpo_context.config import ContextConfig
-
         config = ContextConfig()
         assert config.error_max_count == 50
         assert config.summary_backup_max_count == 20
 
     def test_config_has_compression_settings(self):
-        from karpo_context.config import ContextConfig
-
         config = ContextConfig()
         assert config.proactive_summary_threshold == 0.7
         assert config.tool_result_offload_threshold == 500
@@ -48,61 +42,46 @@ class TestContextConfig:
 class TestContextConfigPresets:
     """Tests for predefined context config presets."""
 
-    def test_fast_preset_exists(self):
-        from karpo_context.config import CONTEXT_CONFIGS
-
-        assert "fast" in CONTEXT_CONFIGS
-
-    def test_personalized_preset_exists(self):
-        from karpo_context.config import CONTEXT_CONFIGS
-
-        assert "personalized" in CONTEXT_CONFIGS
-
-    def test_planning_preset_exists(self):
-        from karpo_context.config import CONTEXT_CONFIGS
-
-        assert "planning" in CONTEXT_CONFIGS
-
-    def test_fast_preset_has_small_budget(self):
-        from karpo_context.config import CONTEXT_CONFIGS
-
-        fast = CONTEXT_CONFIGS["fast"]
-        # Fast mode should have smaller budget for quick responses
-        assert fast.budget.total_limit == 4000
-        assert fast.enable_emotional_context is False
-        assert fast.summary_trigger_threshold == 10
-
-    def test_personalized_preset_has_emotional_context(self):
-        from karpo_context.config import CONTEXT_CONFIGS
-
-        personalized = CONTEXT_CONFIGS["personalized"]
-        assert personalized.enable_emotional_context is True
-        assert personalized.budget.emotional_context >= 200
-
-    def test_planning_preset_has_large_budget(self):
-        from karpo_context.config import CONTEXT_CONFIGS
-
-        planning = CONTEXT_CONFIGS["planning"]
-        # Planning mode needs more context for complex reasoning
-        assert planning.budget.total_limit >= 16000
-        assert planning.budget.recent_history >= 8000
+    @pytest.mark.parametrize(
+        ("preset", "check"),
+        [
+            # Fast mode should have smaller budget for quick responses
+            (
+                "fast",
+                lambda c: c.budget.total_limit == 4000
+                and c.enable_emotional_context is False
+                and c.summary_trigger_threshold == 10,
+            ),
+            (
+                "personalized",
+                lambda c: c.enable_emotional_context is True
+                and c.budget.emotional_context >= 200,
+            ),
+            # Planning mode needs more context for complex reasoning
+            (
+                "planning",
+                lambda c: c.budget.total_limit >= 16000
+                and c.budget.recent_history >= 8000,
+            ),
+        ],
+    )
+    def test_preset(self, preset, check):
+        assert check(CONTEXT_CONFIGS[preset])
+
+    def test_presets_are_read_only(self):
+        with pytest.raises(TypeError):
+            CONTEXT_CONFIGS["custom"] = ContextConfig()
 
     def test_get_config_returns_preset(self):
-        from karpo_context.config import get_config
-
         config = get_config("fast")
         assert config.budget.total_limit == 4000
 
     def test_get_config_returns_default_for_unknown(self):
-        from karpo_context.config import get_config
-
         config = get_config("unknown")
         # Should return default config
         assert config.budget.total_limit == 8000
 
     def test_get_config_with_none_returns_default(self):
-        from karpo_context.config import get_config
-
         config = get_config(None)
         assert config.budget.total_limit == 8000
 
@@ -111,8 +90,6 @@ class TestContextConfigPriorities:
     """Tests for P0/P1/P2 priority configuration."""
 
     def test_config_has_priority_definitions(self):
-        from karpo_context.config import ContextConfig
-
         config = ContextConfig()
         assert hasattr(config, "priority_order")
         assert "p0" in config.priority_order
@@ -120,16 +97,12 @@ class TestContextConfigPriorities:
         assert "p2" in config.priority_order
 
     def test_priority_p0_includes_essential_components(self):
-        from karpo_context.config import ContextConfig
-
         config = ContextConfig()
         p0 = config.priority_order["p0"]
         assert "persona" in p0
         assert "current_input" in p0
 
     def test_priority_p1_includes_important_components(self):
-        from karpo_context.config import ContextConfig
-
         config = ContextConfig()
         p1 = config.priority_order["p1"]
         assert "response_instruction" in p1
@@ -137,8 +110,6 @@ class TestContextConfigPriorities:
         assert "recent_history" in p1
 
     def test_priority_p2_includes_optional_components(self):
-        from karpo_context.config import ContextConfig
-
         config = ContextConfig()
         p2 = config.priority_order["p2"]
         assert "emotional_context" in p2
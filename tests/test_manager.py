@@ -1,31 +1,32 @@
 """Tests for karpo_context.manager.ContextManager."""
-from datetime import datetime, timezone
 from unittest.mock import AsyncMock
 
-import fakeredis.aioredis
 import pytest
 
 from karpo_context.compaction.message_count import MessageCountTrigger
 from karpo_context.compaction.summarizer import LLMSummarizer
+from karpo_context.manager import ContextManager
 from karpo_context.models import ChatMessage, ConversationContext
 from karpo_context.store.redis_store import RedisContextStore
 
 
-@pytest.fixture
-def redis_client():
-    return fakeredis.aioredis.FakeRedis()
-
-
 @pytest.fixture
 def store(redis_client):
     return RedisContextStore(redis_client)
 
 
-@pytest.fixture
-def llm_mock():
+@pytest.fixture(scope="module")
+def _shared_llm_mock():
     return AsyncMock(return_value="Compacted summary.")
 
 
+@pytest.fixture
+def llm_mock(_shared_llm_mock):
+    """The module's LLM mock, with call history cleared after each test."""
+    yield _shared_llm_mock
+    _shared_llm_mock.reset_mock()
+
+
 @pytest.fixture
 def trigger():
     return MessageCountTrigger(threshold=5)
@@ -38,8 +39,6 @@ def summarizer(llm_mock):
 
 class TestLoad:
     async def test_load_nonexistent_creates_new(self, store):
-        from karpo_context.manager import ContextManager
-
         manager = ContextManager(store=store)
         ctx = await manager.load(42)
         assert ctx.conversation_id == 42
@@ -48,10 +47,7 @@ class TestLoad:
         assert ctx.created_at is not None
         assert ctx.updated_at is not None
 
-    async def test_load_existing_returns_stored(self, store):
-        from karpo_context.manager import ContextManager
-
-        now = datetime.now(timezone.utc)
+    async def test_load_existing_returns_stored(self, now, store):
         ctx = ConversationContext(
             conversation_id=1, created_at=now, updated_at=now, phase="confirming"
         )
@@ -64,30 +60,23 @@ class TestLoad:
 
 
 class TestSave:
-    async def test_save_stores_context(self, store):
-        from karpo_context.manager import ContextManager
-
+    async def test_save_stores_context(self, now, store):
         manager = ContextManager(store=store)
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(conversation_id=10, created_at=now, updated_at=now)
         await manager.save(ctx)
         loaded = await store.get(10)
         assert loaded is not None
         assert loaded.conversation_id == 10
 
-    async def test_no_compaction_below_threshold(self, store, trigger, summarizer):
-        from karpo_context.manager import ContextManager
-
+    async def test_no_compaction_below_threshold(
+        self, now, store, trigger, summarizer, msgs_factory
+    ):
         manager = ContextManager(
             store=store, trigger=trigger, summarizer=summarizer
         )
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(
             conversation_id=11,
-            messages=[
-                ChatMessage(role="user", content=f"msg{i}", created_at=now)
-                for i in range(3)
-            ],
+            messages=list(msgs_factory(3)),
             created_at=now,
             updated_at=now,
             message_count=3,
@@ -98,20 +87,14 @@ class TestSave:
         assert loaded.summary is None
 
     async def test_compaction_triggered_when_exceeded(
-        self, store, trigger, summarizer
+        self, now, store, trigger, summarizer, msgs_factory
     ):
-        from karpo_context.manager import ContextManager
-
         manager = ContextManager(
             store=store, trigger=trigger, summarizer=summarizer, keep_recent=3
         )
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(
             conversation_id=12,
-            messages=[
-                ChatMessage(role="user", content=f"msg{i}", created_at=now)
-                for i in range(8)
-            ],
+            messages=list(msgs_factory(8)),
             created_at=now,
             updated_at=now,
             message_count=8,
@@ -127,22 +110,16 @@ class TestSave:
 
 
 class TestAppendMessage:
-    async def test_append_to_nonexistent_creates_and_appends(self, store):
-        from karpo_context.manager import ContextManager
-
+    async def test_append_to_nonexistent_creates_and_appends(self, now, store):
         manager = ContextManager(store=store)
-        now = datetime.now(timezone.utc)
         msg = ChatMessage(role="user", content="Hello", created_at=now)
         ctx = await manager.append_message(100, msg)
         assert len(ctx.messages) == 1
         assert ctx.messages[0].content == "Hello"
         assert ctx.message_count == 1
 
-    async def test_append_to_existing(self, store):
-        from karpo_context.manager import ContextManager
-
+    async def test_append_to_existing(self, now, store):
         manager = ContextManager(store=store)
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(
             conversation_id=101,
             messages=[ChatMessage(role="user", content="First", created_at=now)],
@@ -157,11 +134,8 @@ class TestAppendMessage:
         assert len(updated.messages) == 2
         assert updated.message_count == 2
 
-    async def test_append_updates_updated_at(self, store):
-        from karpo_context.manager import ContextManager
-
+    async def test_append_updates_updated_at(self, now, store):
         manager = ContextManager(store=store)
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(
             conversation_id=102, created_at=now, updated_at=now
         )
@@ -173,17 +147,11 @@ class TestAppendMessage:
 
 
 class TestWithoutOptionalDeps:
-    async def test_works_without_trigger_and_summarizer(self, store):
-        from karpo_context.manager import ContextManager
-
+    async def test_works_without_trigger_and_summarizer(self, now, store, msgs_factory):
         manager = ContextManager(store=store)
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(
             conversation_id=200,
-            messages=[
-                ChatMessage(role="user", content=f"msg{i}", created_at=now)
-                for i in range(100)
-            ],
+            messages=list(msgs_factory(100)),
             created_at=now,
             updated_at=now,
             message_count=100,
@@ -1,12 +1,10 @@
 """Tests for karpo_context.models data classes."""
-from datetime import datetime, timezone
 
 
 class TestChatMessage:
-    def test_create_user_message(self):
+    def test_create_user_message(self, now):
         from karpo_context.models import ChatMessage
 
-        now = datetime.now(timezone.utc)
         msg = ChatMessage(role="user", content="Hello", created_at=now)
         assert msg.role == "user"
         assert msg.content == "Hello"
@@ -15,10 +13,9 @@ class TestChatMessage:
         assert msg.tool_call_id is None
         assert msg.tool_calls is None
 
-    def test_create_tool_message(self):
+    def test_create_tool_message(self, now):
         from karpo_context.models import ChatMessage
 
-        now = datetime.now(timezone.utc)
         msg = ChatMessage(
             role="tool",
             content='{"result": 42}',
@@ -27,10 +24,9 @@ class TestChatMessage:
         )
         assert msg.tool_call_id == "call_abc123"
 
-    def test_create_message_with_tool_calls(self):
+    def test_create_message_with_tool_calls(self, now):
         from karpo_context.models import ChatMessage
 
-        now = datetime.now(timezone.utc)
         tool_calls = [
             {
                 "id": "call_1",
@@ -43,10 +39,9 @@ class TestChatMessage:
         )
         assert msg.tool_calls == tool_calls
 
-    def test_chat_message_to_dict_and_from_dict(self):
+    def test_chat_message_to_dict_and_from_dict(self, now):
         from karpo_context.models import ChatMessage
 
-        now = datetime.now(timezone.utc)
         msg = ChatMessage(role="user", content="test", created_at=now)
         d = msg.to_dict()
         assert d["role"] == "user"
@@ -54,12 +49,77 @@ class TestChatMessage:
         assert restored.role == "user"
         assert restored.created_at == now
 
+    def test_chat_message_from_dict_matches_constructor(self, now):
+        import dataclasses
+
+        import pytest
+
+        from karpo_context.models import ChatMessage
+
+        msg = ChatMessage(
+            role="assistant",
+            content=None,
+            created_at=now,
+            tool_calls=[{"id": "call_1"}],
+        )
+        restored = ChatMessage.from_dict(msg.to_dict())
+        assert restored == msg
+        assert repr(restored) == repr(msg)
+        for f in dataclasses.fields(ChatMessage):
+            getattr(restored, f.name)
+        assert restored.to_dict() == msg.to_dict()
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            restored.content = "changed"
+
+    def test_chat_message_is_frozen(self, now):
+        import dataclasses
+
+        import pytest
+
+        from karpo_context.models import ChatMessage
+
+        msg = ChatMessage(role="user", content="test", created_at=now)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            msg.content = "changed"
+
+    def test_chat_message_has_no_instance_dict(self, now):
+        from karpo_context.models import ChatMessage
+
+        msg = ChatMessage(role="user", content="test", created_at=now)
+        assert not hasattr(msg, "__dict__")
+
+    def test_chat_message_to_dict_returns_independent_copies(self, now):
+        from karpo_context.models import ChatMessage
+
+        msg = ChatMessage(role="user", content="test", created_at=now)
+        first = msg.to_dict()
+        first["content"] = "mutated"
+        second = msg.to_dict()
+        assert second["content"] == "test"
+        assert second["created_at"] == now.isoformat()
+
+    def test_chat_message_from_dict_interns_role(self, now):
+        import json
+
+        from karpo_context.models import ChatMessage
+
+        msg = ChatMessage(role="assistant", content="Hi", created_at=now)
+        decoded = ChatMessage.from_dict(json.loads(json.dumps(msg.to_dict())))
+        assert decoded.role is msg.role
+
+    def test_chat_message_chinese_chars(self, now):
+        from karpo_context.models import ChatMessage
+
+        msg = ChatMessage(role="user", content="帮我规划东京5日游", created_at=now)
+        assert msg.chinese_chars == 8
+        assert ChatMessage.from_dict(msg.to_dict()).chinese_chars == 8
+        assert ChatMessage(role="assistant", content=None, created_at=now).chinese_chars == 0
+
 
 class TestToolCallRecord:
-    def test_create_and_roundtrip(self):
+    def test_create_and_roundtrip(self, now):
         from karpo_context.models import ToolCallRecord
 
-        now = datetime.now(timezone.utc)
         record = ToolCallRecord(
             tool_name="search",
             arguments={"q": "hi"},
@@ -74,10 +134,9 @@ class TestToolCallRecord:
 
 
 class TestConversationContext:
-    def test_create_default(self):
+    def test_create_default(self, now):
         from karpo_context.models import ConversationContext
 
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(
             conversation_id=42, created_at=now, updated_at=now
         )
@@ -86,14 +145,13 @@ class TestConversationContext:
         assert ctx.phase == "idle"
         assert ctx.message_count == 0
 
-    def test_full_roundtrip(self):
+    def test_full_roundtrip(self, now):
         from karpo_context.models import (
             ChatMessage,
             ConversationContext,
             ToolCallRecord,
         )
 
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(
             conversation_id=99,
             messages=[
@@ -1,33 +1,38 @@
 """Tests for ContextPipeline - the main entry point for context assembly."""
 import pytest
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock
-
-import fakeredis.aioredis
+from unittest.mock import patch
 
 from karpo_context.models import SessionState, ConversationSummary
 from karpo_context.config import ContextConfig, get_config
 from karpo_context.budget import ContextBudget
 
 
-@pytest.fixture
-def redis_client():
-    return fakeredis.aioredis.FakeRedis()
+_SUMMARY = ConversationSummary(
+    covers_until_turn=5,
+    generated_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    user_intent="Test intent",
+    key_entities={},
+    decisions_made=[],
+    pending_questions=[],
+)
+
+
+class _StubSummarizer:
+    """Summarizer that returns a fixed summary and records its calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[list[dict], str | None]] = []
+
+    async def summarize(self, messages, existing_summary=None):
+        self.calls.append((messages, existing_summary))
+        return _SUMMARY
 
 
 @pytest.fixture
-def mock_summarizer():
-    """Mock summarizer that returns a simple summary."""
-    summarizer = AsyncMock()
-    summarizer.summarize.return_value = ConversationSummary(
-        covers_until_turn=5,
-        generated_at=datetime.now(timezone.utc),
-        user_intent="Test intent",
-        key_entities={},
-        decisions_made=[],
-        pending_questions=[],
-    )
-    return summarizer
+def stub_summarizer():
+    """Stub summarizer that returns a simple summary."""
+    return _StubSummarizer()
 
 
 class TestContextPipelineInit:
@@ -69,13 +74,12 @@ class TestContextPipelineLoad:
         assert session.user_id == "user-001"
         assert session.turn_count == 0
 
-    async def test_load_returns_existing_session(self, redis_client):
+    async def test_load_returns_existing_session(self, now, redis_client):
         from karpo_context.pipeline import ContextPipeline
         from karpo_context.store.session_store import SessionStateStore
 
         # Pre-create a session
         store = SessionStateStore(redis_client, agent_name="travel")
-        now = datetime.now(timezone.utc)
         existing = SessionState(
             thread_id=1,
             user_id="user-001",
@@ -129,6 +133,26 @@ class TestContextPipelineEstimate:
         assert "degradation_level" in estimate
         assert estimate["degradation_level"] in [0, 1, 2, 3]
 
+    async def test_estimate_reuses_prompt_sizes_within_turn(self, redis_client):
+        from karpo_context.pipeline import ContextPipeline
+
+        pipeline = ContextPipeline(redis_client=redis_client, agent_name="travel")
+        session = await pipeline.load(thread_id=1, user_id="user-001")
+        session = pipeline.merge(session, user_input="I want to go to Tokyo")
+        persona = "You are a travel agent."
+
+        with patch.object(
+            pipeline._budget_manager,
+            "estimate_tokens_bulk",
+            wraps=pipeline._budget_manager.estimate_tokens_bulk,
+        ) as bulk:
+            first = pipeline.estimate(session, persona=persona)
+            second = pipeline.estimate(session, persona=persona)
+            pipeline.compress(session, persona=persona)
+
+        assert bulk.call_count == 1
+        assert first["persona_tokens"] == second["persona_tokens"] > 0
+
     async def test_estimate_calculates_degradation_level(self, redis_client):
         from karpo_context.pipeline import ContextPipeline
 
@@ -176,8 +200,29 @@ class TestContextPipelineCompress:
         # History should be trimmed
         assert len(compressed.messages) <= original_count
 
+    async def test_compress_keeps_turn_count(self, redis_client):
+        from karpo_context.pipeline import ContextPipeline
+
+        config = ContextConfig(
+            budget=ContextBudget(total_limit=500, recent_history=200)
+        )
+        pipeline = ContextPipeline(
+            redis_client=redis_client,
+            agent_name="travel",
+            config=config,
+        )
+        session = await pipeline.load(thread_id=1, user_id="user-001")
+        for i in range(20):
+            session = pipeline.merge(session, user_input=f"Message {i} " * 10)
+
+        compressed = pipeline.compress(session, persona="Agent")
+
+        # turn_count is a running counter, not derived from kept messages
+        assert len(compressed.messages) < 20
+        assert compressed.turn_count == 20
+
     async def test_compress_triggers_summary_when_needed(
-        self, redis_client, mock_summarizer
+        self, redis_client, stub_summarizer
     ):
         from karpo_context.pipeline import ContextPipeline
 
@@ -186,7 +231,7 @@ class TestContextPipelineCompress:
             redis_client=redis_client,
             agent_name="travel",
             config=config,
-            summarizer=mock_summarizer,
+            summarizer=stub_summarizer,
         )
         session = await pipeline.load(thread_id=1, user_id="user-001")
 
@@ -199,7 +244,93 @@ class TestContextPipelineCompress:
         # Compressed session should be returned
         assert compressed is not None
         # Summary should have been generated
-        mock_summarizer.summarize.assert_called_once()
+        assert len(stub_summarizer.calls) == 1
+
+    async def test_compress_async_sends_only_unsummarized_turns(
+        self, redis_client, stub_summarizer
+    ):
+        from karpo_context.pipeline import ContextPipeline
+
+        config = ContextConfig(summary_trigger_threshold=2)
+        pipeline = ContextPipeline(
+            redis_client=redis_client,
+            agent_name="travel",
+            config=config,
+            summarizer=stub_summarizer,
+        )
+        session = await pipeline.load(thread_id=1, user_id="user-001")
+        for i in range(3):
+            session.add_message("user", f"Q{i}")
+            session.add_message("assistant", f"A{i}")
+        session.add_message("user", "Q3")
+        session.summary = ConversationSummary(
+            covers_until_turn=3,
+            generated_at=datetime.now(timezone.utc),
+            user_intent="Plan Tokyo trip",
+            key_entities={},
+            decisions_made=[],
+            pending_questions=[],
+        )
+
+        await pipeline.compress_async(session, persona="Agent")
+
+        messages, existing = stub_summarizer.calls[-1]
+        assert [m["content"] for m in messages] == ["Q2", "A2", "Q3"]
+        assert "Plan Tokyo trip" in existing
+
+        # Turns after an older summary are all sent, not just the last one
+        session.summary = ConversationSummary(
+            covers_until_turn=2,
+            generated_at=datetime.now(timezone.utc),
+            user_intent="Plan Tokyo trip",
+            key_entities={},
+            decisions_made=[],
+            pending_questions=[],
+        )
+        await pipeline.compress_async(session, persona="Agent")
+        messages, _ = stub_summarizer.calls[-1]
+        assert [m["content"] for m in messages] == ["Q1", "A1", "Q2", "A2", "Q3"]
+
+        session.summary = ConversationSummary(
+            covers_until_turn=3,
+            generated_at=datetime.now(timezone.utc),
+            user_intent="Plan Tokyo trip",
+            key_entities={},
+            decisions_made=[],
+            pending_questions=[],
+        )
+        pipeline._config.summary_incremental = False
+        await pipeline.compress_async(session, persona="Agent")
+        messages, _ = stub_summarizer.calls[-1]
+        assert len(messages) == 7
+
+    async def test_compress_async_resumes_after_its_own_summary(
+        self, redis_client, stub_summarizer
+    ):
+        from karpo_context.pipeline import ContextPipeline
+
+        config = ContextConfig(summary_trigger_threshold=2)
+        pipeline = ContextPipeline(
+            redis_client=redis_client,
+            agent_name="travel",
+            config=config,
+            summarizer=stub_summarizer,
+        )
+        session = await pipeline.load(thread_id=1, user_id="user-001")
+        for i in range(2):
+            session.add_message("user", f"Q{i}")
+            session.add_message("assistant", f"A{i}")
+        session.add_message("user", "Q2")
+
+        session = await pipeline.compress_async(session, persona="Agent")
+        assert session.summary.covers_until_turn == 3
+
+        session.add_message("assistant", "A2")
+        session.add_message("user", "Q3")
+        session = await pipeline.compress_async(session, persona="Agent")
+        messages, _ = stub_summarizer.calls[-1]
+        assert [m["content"] for m in messages] == ["Q2", "A2", "Q3"]
+        assert session.summary.covers_until_turn == 4
 
 
 class TestContextPipelineAssemble:
@@ -222,6 +353,22 @@ class TestContextPipelineAssemble:
         assert "messages" in result
         assert result["messages"][-1]["content"] == "I want to go to Tokyo"
 
+    async def test_assemble_system_prompt_layout(self, redis_client):
+        from karpo_context.pipeline import ContextPipeline
+
+        pipeline = ContextPipeline(redis_client=redis_client, agent_name="travel")
+        session = await pipeline.load(thread_id=1, user_id="user-001")
+
+        assert pipeline.assemble(session, persona="P")["system_prompt"] == "P"
+        assert (
+            pipeline.assemble(session, persona="P", instruction="I")["system_prompt"]
+            == "P\n\nI"
+        )
+        result = pipeline.assemble(
+            session, persona="P", instruction="I", emotional_context="E"
+        )
+        assert result["system_prompt"] == "P\n\nI\n\n## Context\nE"
+
     async def test_assemble_includes_summary_when_present(self, redis_client):
         from karpo_context.pipeline import ContextPipeline
 
@@ -247,6 +394,41 @@ class TestContextPipelineAssemble:
         assert "Tokyo" in result["system_prompt"]
         assert "Plan Tokyo trip" in result["system_prompt"]
 
+    async def test_summary_tokens_estimated_once_per_summary(self, redis_client):
+        from karpo_context.pipeline import ContextPipeline
+
+        pipeline = ContextPipeline(redis_client=redis_client, agent_name="travel")
+        session = await pipeline.load(thread_id=1, user_id="user-001")
+        session.summary = ConversationSummary(
+            covers_until_turn=5,
+            generated_at=datetime.now(timezone.utc),
+            user_intent="Plan Tokyo trip",
+            key_entities={"destination": "Tokyo"},
+            decisions_made=[],
+            pending_questions=[],
+        )
+        session = pipeline.merge(session, user_input="What about hotels?")
+
+        budget_manager = pipeline._budget_manager
+        with patch.object(
+            budget_manager, "estimate_tokens", wraps=budget_manager.estimate_tokens
+        ) as est:
+            estimate = pipeline.estimate(session, persona="Agent")
+            pipeline.compress(session, persona="Agent")
+            result = pipeline.assemble(session, persona="Agent")
+
+        summary_text = result["system_prompt"].split("## Conversation Summary\n")[1]
+        assert [c.args for c in est.call_args_list].count((summary_text,)) == 1
+        assert estimate["summary_tokens"] > 0
+        assert "Plan Tokyo trip" in summary_text
+
+        # In-place edits are picked up
+        session.summary.pending_questions.append("Which district?")
+        edited = pipeline.estimate(session, persona="Agent")
+        assert edited["summary_tokens"] > estimate["summary_tokens"]
+        result = pipeline.assemble(session, persona="Agent")
+        assert "Pending: Which district?" in result["system_prompt"]
+
 
 class TestContextPipelineComplete:
     """Tests for the Complete stage of the pipeline."""
@@ -268,6 +450,45 @@ class TestContextPipelineComplete:
         assert loaded.messages[1].content == "Hi there!"
         assert loaded.messages[1].role == "assistant"
 
+    async def test_complete_writes_error_in_same_turn(self, redis_client):
+        from karpo_context.pipeline import ContextPipeline
+        from karpo_context.store.session_store import SessionStateStore
+
+        pipeline = ContextPipeline(redis_client=redis_client, agent_name="travel")
+        session = await pipeline.load(thread_id=1, user_id="user-001")
+        session = pipeline.merge(session, user_input="Hello")
+
+        await pipeline.complete(
+            session,
+            assistant_response="Sorry, search failed.",
+            error={"tool_name": "search_flights", "message": "Timeout"},
+        )
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        errors = await store.get_errors(1)
+        assert errors == [{"tool_name": "search_flights", "message": "Timeout"}]
+        loaded = await store.get(1)
+        assert len(loaded.messages) == 2
+
+    async def test_complete_writes_in_background_until_drained(self, redis_client):
+        from karpo_context.pipeline import ContextPipeline
+        from karpo_context.store.session_store import SessionStateStore
+
+        pipeline = ContextPipeline(redis_client=redis_client, agent_name="travel")
+        session = await pipeline.load(thread_id=1, user_id="user-001")
+        session = pipeline.merge(session, user_input="Hello")
+
+        await pipeline.complete(
+            session, assistant_response="Hi there!", durable=False
+        )
+        # Later edits to the session are not part of the queued write
+        session.add_message("user", "Not sent yet")
+        await pipeline.drain()
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        loaded = await store.get(1)
+        assert [m.content for m in loaded.messages] == ["Hello", "Hi there!"]
+
     async def test_complete_adds_assistant_message(self, redis_client):
         from karpo_context.pipeline import ContextPipeline
 
@@ -103,9 +103,8 @@ class TestConversationSummary:
 class TestSessionState:
     """Tests for SessionState dataclass."""
 
-    def test_create_session(self):
+    def test_create_session(self, now):
         """Test creating a SessionState."""
-        now = datetime.now(timezone.utc)
         session = SessionState(
             thread_id=12345,
             user_id="user-001",
@@ -119,9 +118,24 @@ class TestSessionState:
         assert session.summary is None
         assert session.turn_count == 0
 
-    def test_session_with_messages(self):
+    def test_session_and_summary_have_no_instance_dict(self, now):
+        """SessionState and ConversationSummary use __slots__."""
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        summary = ConversationSummary(
+            covers_until_turn=1,
+            generated_at=now,
+            user_intent="",
+            key_entities={},
+            decisions_made=[],
+            pending_questions=[],
+        )
+        assert not hasattr(session, "__dict__")
+        assert not hasattr(summary, "__dict__")
+
+    def test_session_with_messages(self, now):
         """Test session with messages."""
-        now = datetime.now(timezone.utc)
         msg = ChatMessage(
             role="user",
             content="Hello",
@@ -140,9 +154,8 @@ class TestSessionState:
         assert session.messages[0].content == "Hello"
         assert session.turn_count == 1
 
-    def test_session_with_summary(self):
+    def test_session_with_summary(self, now):
         """Test session with structured summary."""
-        now = datetime.now(timezone.utc)
         summary = ConversationSummary(
             covers_until_turn=5,
             generated_at=now,
@@ -162,9 +175,8 @@ class TestSessionState:
         assert session.summary is not None
         assert session.summary.user_intent == "Plan trip"
 
-    def test_add_message_increments_turn_for_user(self):
+    def test_add_message_increments_turn_for_user(self, now):
         """Test that adding user message increments turn count."""
-        now = datetime.now(timezone.utc)
         session = SessionState(
             thread_id=1,
             user_id="user-001",
@@ -184,9 +196,8 @@ class TestSessionState:
         assert session.turn_count == 2
         assert len(session.messages) == 3
 
-    def test_add_message_with_tool_calls(self):
+    def test_add_message_with_tool_calls(self, now):
         """Test adding message with tool calls."""
-        now = datetime.now(timezone.utc)
         session = SessionState(
             thread_id=1,
             user_id="user-001",
@@ -200,9 +211,8 @@ class TestSessionState:
         assert len(session.messages) == 1
         assert session.messages[0].tool_calls == tool_calls
 
-    def test_add_tool_result(self):
+    def test_add_tool_result(self, now):
         """Test adding tool result message."""
-        now = datetime.now(timezone.utc)
         session = SessionState(
             thread_id=1,
             user_id="user-001",
@@ -295,9 +305,8 @@ class TestSessionState:
         session = SessionState.from_dict(d)
         assert session.summary is None
 
-    def test_session_summary_refs_and_error_refs(self):
+    def test_session_summary_refs_and_error_refs(self, now):
         """Test session with summary_refs and error_refs lists."""
-        now = datetime.now(timezone.utc)
         session = SessionState(
             thread_id=1,
             user_id="user-001",
@@ -310,9 +319,8 @@ class TestSessionState:
         assert session.summary_refs == ["001", "002"]
         assert session.error_refs == ["err_001"]
 
-    def test_session_to_dict_with_refs(self):
+    def test_session_to_dict_with_refs(self, now):
         """Test serialization includes refs."""
-        now = datetime.now(timezone.utc)
         session = SessionState(
             thread_id=1,
             user_id="user-001",
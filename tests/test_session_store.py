@@ -3,14 +3,8 @@ import json
 from datetime import datetime, timezone
 
 import pytest
-import fakeredis.aioredis
 
-from karpo_context.models import SessionState, ConversationSummary
-
-
-@pytest.fixture
-def redis_client():
-    return fakeredis.aioredis.FakeRedis()
+from karpo_context.models import ChatMessage, SessionState, ConversationSummary
 
 
 class TestSessionStateStore:
@@ -29,11 +23,10 @@ class TestSessionStateStore:
         result = await store.get(999)
         assert result is None
 
-    async def test_save_and_get_roundtrip(self, redis_client):
+    async def test_save_and_get_roundtrip(self, now, redis_client):
         from karpo_context.store.session_store import SessionStateStore
 
         store = SessionStateStore(redis_client, agent_name="travel")
-        now = datetime.now(timezone.utc)
         session = SessionState(
             thread_id=1,
             user_id="user-001",
@@ -46,11 +39,10 @@ class TestSessionStateStore:
         assert loaded.thread_id == 1
         assert loaded.user_id == "user-001"
 
-    async def test_save_and_get_with_messages(self, redis_client):
+    async def test_save_and_get_with_messages(self, now, redis_client):
         from karpo_context.store.session_store import SessionStateStore
 
         store = SessionStateStore(redis_client, agent_name="travel")
-        now = datetime.now(timezone.utc)
         session = SessionState(
             thread_id=2,
             user_id="user-001",
@@ -66,11 +58,10 @@ class TestSessionStateStore:
         assert loaded.messages[0].content == "Hello"
         assert loaded.turn_count == 1
 
-    async def test_save_and_get_with_summary(self, redis_client):
+    async def test_save_and_get_with_summary(self, now, redis_client):
         from karpo_context.store.session_store import SessionStateStore
 
         store = SessionStateStore(redis_client, agent_name="travel")
-        now = datetime.now(timezone.utc)
         summary = ConversationSummary(
             covers_until_turn=5,
             generated_at=now,
@@ -94,11 +85,10 @@ class TestSessionStateStore:
         assert loaded.summary.user_intent == "Plan Tokyo trip"
         assert loaded.summary.key_entities["destination"] == "Tokyo"
 
-    async def test_key_format_uses_agent_name(self, redis_client):
+    async def test_key_format_uses_agent_name(self, now, redis_client):
         from karpo_context.store.session_store import SessionStateStore
 
         store = SessionStateStore(redis_client, agent_name="travel")
-        now = datetime.now(timezone.utc)
         session = SessionState(
             thread_id=100,
             user_id="user-001",
@@ -112,12 +102,11 @@ class TestSessionStateStore:
         data = json.loads(raw)
         assert data["thread_id"] == 100
 
-    async def test_different_agents_have_separate_keys(self, redis_client):
+    async def test_different_agents_have_separate_keys(self, now, redis_client):
         from karpo_context.store.session_store import SessionStateStore
 
         travel_store = SessionStateStore(redis_client, agent_name="travel")
         dining_store = SessionStateStore(redis_client, agent_name="dining")
-        now = datetime.now(timezone.utc)
 
         travel_session = SessionState(
             thread_id=1, user_id="user-001", created_at=now, updated_at=now
@@ -137,11 +126,10 @@ class TestSessionStateStore:
         assert loaded_travel.messages[0].content == "I want to go to Tokyo"
         assert loaded_dining.messages[0].content == "I want sushi"
 
-    async def test_delete(self, redis_client):
+    async def test_delete(self, now, redis_client):
         from karpo_context.store.session_store import SessionStateStore
 
         store = SessionStateStore(redis_client, agent_name="travel")
-        now = datetime.now(timezone.utc)
         session = SessionState(
             thread_id=4, user_id="user-001", created_at=now, updated_at=now
         )
@@ -150,11 +138,10 @@ class TestSessionStateStore:
         result = await store.get(4)
         assert result is None
 
-    async def test_ttl_is_set(self, redis_client):
+    async def test_ttl_is_set(self, now, redis_client):
         from karpo_context.store.session_store import SessionStateStore
 
         store = SessionStateStore(redis_client, agent_name="travel", ttl_seconds=3600)
-        now = datetime.now(timezone.utc)
         session = SessionState(
             thread_id=5, user_id="user-001", created_at=now, updated_at=now
         )
@@ -163,6 +150,478 @@ class TestSessionStateStore:
         assert ttl > 0
         assert ttl <= 3600
 
+    async def test_get_and_touch_refreshes_ttl(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel", ttl_seconds=3600)
+        session = SessionState(
+            thread_id=6, user_id="user-001", created_at=now, updated_at=now
+        )
+        await store.save(session)
+        await redis_client.expire("ctx:travel:session:6", 10)
+
+        loaded = await store.get_and_touch(6)
+        assert loaded is not None
+        assert loaded.thread_id == 6
+        ttl = await redis_client.ttl("ctx:travel:session:6")
+        assert ttl > 10
+
+    async def test_get_and_touch_nonexistent_returns_none(self, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        assert await store.get_and_touch(999) is None
+        assert await redis_client.exists("ctx:travel:session:999") == 0
+
+
+class TestGetMany:
+    """Tests for fetching several sessions at once."""
+
+    async def test_get_many_preserves_order_and_misses(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        for thread_id in (1, 2):
+            session = SessionState(
+                thread_id=thread_id, user_id="user-001", created_at=now, updated_at=now
+            )
+            session.add_message("user", f"Hello {thread_id}")
+            await store.save(session)
+
+        sessions = await store.get_many([2, 999, 1])
+        assert [s and s.thread_id for s in sessions] == [2, None, 1]
+        assert sessions[0].messages[0].content == "Hello 2"
+        assert not sessions[0].dirty
+        assert await store.get_many([]) == []
+
+
+class TestDirtyTracking:
+    """Tests for skipping saves of unchanged sessions."""
+
+    async def test_save_skips_unchanged_session(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        assert session.dirty
+        await store.save(session)
+        assert not session.dirty
+
+        # Tag the stored copy; a write would overwrite it
+        await redis_client.set("ctx:travel:session:1", b'{"tag": 1}', ex=10)
+        await store.save(session)
+        assert json.loads(await redis_client.get("ctx:travel:session:1")) == {"tag": 1}
+        assert await redis_client.ttl("ctx:travel:session:1") > 10
+
+        await store.delete(1)
+        await store.save(session)
+        assert (await store.get(1)).user_id == "user-001"
+
+        session.summary_refs.append("001")
+        await store.save(session)
+        assert (await store.get(1)).summary_refs == ["001"]
+
+        session.messages.append(
+            ChatMessage(role="user", content="Hello", created_at=now)
+        )
+        await store.save(session)
+        assert [m.content for m in (await store.get(1)).messages] == ["Hello"]
+
+    async def test_session_from_another_store_is_saved(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        travel = SessionStateStore(redis_client, agent_name="travel")
+        hotel = SessionStateStore(redis_client, agent_name="hotel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        session.add_message("user", "Hello")
+        await travel.save(session)
+
+        await hotel.save(session)
+        loaded = await hotel.get(1)
+        assert [m.content for m in loaded.messages] == ["Hello"]
+
+    async def test_failed_write_leaves_session_dirty(self, now, redis_client):
+        from redis.exceptions import ResponseError
+
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        session.add_message("user", "Hello")
+        await redis_client.set("ctx:travel:errors:1", "not a list")
+        with pytest.raises(ResponseError):
+            await store.commit_turn(session, error={"message": "boom"})
+        assert session.dirty
+
+        await redis_client.flushdb()
+        await store.save(session)
+        loaded = await store.get(1)
+        assert [m.content for m in loaded.messages] == ["Hello"]
+
+    async def test_loaded_session_is_clean_until_changed(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        await store.save(session)
+
+        loaded = await store.get_and_touch(1)
+        assert not loaded.dirty
+        loaded.add_message("user", "Hello")
+        assert loaded.dirty
+
+        loaded = await store.get(1)
+        loaded.messages = []
+        assert loaded.dirty
+
+
+class TestMessageList:
+    """Tests for storing messages in their own append-only list."""
+
+    async def test_only_new_messages_are_pushed(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        session.add_message("user", "Hello")
+        await store.commit_turn(session)
+        assert "messages" not in json.loads(
+            await redis_client.get("ctx:travel:session:1")
+        )
+
+        loaded = await store.get(1)
+        # Tag the stored copy; a full rewrite would overwrite it
+        first = json.loads(await redis_client.lindex("ctx:travel:messages:1", 0))
+        first["content"] = "untouched"
+        await redis_client.lset("ctx:travel:messages:1", 0, json.dumps(first))
+        loaded.add_message("assistant", "Hi!")
+        await store.commit_turn(loaded)
+
+        raw = await redis_client.lrange("ctx:travel:messages:1", 0, -1)
+        assert [json.loads(m)["content"] for m in raw] == ["untouched", "Hi!"]
+        assert 0 < await redis_client.ttl("ctx:travel:messages:1") <= 7 * 24 * 3600
+
+    async def test_dropped_head_is_trimmed(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        for i in range(4):
+            session.add_message("user", f"msg{i}")
+        await store.save(session)
+
+        session.messages = session.messages[2:]
+        session.add_message("user", "msg4")
+        await store.save(session)
+
+        loaded = await store.get(1)
+        assert [m.content for m in loaded.messages] == ["msg2", "msg3", "msg4"]
+
+        loaded.messages = []
+        await store.save(loaded)
+        assert await redis_client.exists("ctx:travel:messages:1") == 0
+        assert (await store.get(1)).messages == []
+
+    async def test_edited_history_is_rewritten(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        session.add_message("user", "Hello")
+        session.add_message("assistant", "Hi!")
+        await store.save(session)
+
+        session.messages[1] = ChatMessage(
+            role="assistant", content="Hello there", created_at=now
+        )
+        session.mark_dirty()
+        await store.save(session)
+
+        loaded = await store.get(1)
+        assert [m.content for m in loaded.messages] == ["Hello", "Hello there"]
+
+    async def test_list_out_of_sync_is_rewritten(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        session.add_message("user", "Hello")
+        await store.save(session)
+
+        await redis_client.delete("ctx:travel:messages:1")
+        session.add_message("assistant", "Hi!")
+        await store.save(session)
+
+        loaded = await store.get(1)
+        assert [m.content for m in loaded.messages] == ["Hello", "Hi!"]
+
+    async def test_reads_legacy_inline_messages(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        legacy = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        legacy.add_message("user", "Hello")
+        await redis_client.set("ctx:travel:session:1", json.dumps(legacy.to_dict()))
+
+        loaded = await store.get(1)
+        assert [m.content for m in loaded.messages] == ["Hello"]
+
+        loaded.add_message("assistant", "Hi!")
+        await store.save(loaded)
+        assert await redis_client.llen("ctx:travel:messages:1") == 2
+        assert "messages" not in json.loads(
+            await redis_client.get("ctx:travel:session:1")
+        )
+
+    async def test_delete_removes_messages(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        session.add_message("user", "Hello")
+        await store.save(session)
+
+        await store.delete(1)
+        assert await redis_client.exists("ctx:travel:messages:1") == 0
+
+
+class TestCommitTurn:
+    """Tests for batched end-of-turn writes."""
+
+    async def test_commit_turn_saves_session(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel", ttl_seconds=3600)
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        session.add_message("user", "Hello")
+        await store.commit_turn(session)
+
+        loaded = await store.get(1)
+        assert loaded.messages[0].content == "Hello"
+        assert 0 < await redis_client.ttl("ctx:travel:session:1") <= 3600
+        assert await store.get_errors(1) == []
+        assert await store.get_summary_backups(1) == []
+
+    async def test_commit_turn_with_error_and_backup(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(
+            redis_client,
+            agent_name="travel",
+            error_max_count=2,
+            summary_backup_max_count=2,
+        )
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        for i in range(3):
+            await store.commit_turn(
+                session,
+                error={"step": i},
+                summary_backup={"summary": {"covers_until_turn": i}},
+            )
+
+        errors = await store.get_errors(1)
+        backups = await store.get_summary_backups(1)
+        assert [e["step"] for e in errors] == [1, 2]
+        assert [b["summary"]["covers_until_turn"] for b in backups] == [1, 2]
+        assert await redis_client.ttl("ctx:travel:errors:1") > 0
+
+    async def test_commit_turn_with_tool_results(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel", ttl_seconds=3600)
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        await store.commit_turn(
+            session, tool_results={"call_a": {"flights": []}, "call_b": [1, 2]}
+        )
+
+        assert await store.get_tool_result(1, "call_a") == {"flights": []}
+        assert await store.get_tool_result(1, "call_b") == [1, 2]
+        assert 0 < await redis_client.ttl("ctx:travel:tool:1:call_a") <= 3600
+
+
+class TestBackgroundCommitTurn:
+    """Tests for write-behind end-of-turn saves."""
+
+    async def test_get_waits_for_pending_write(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        for text in ("one", "two", "three"):
+            session.add_message("user", text)
+            await store.commit_turn_in_background(session, error={"step": text})
+
+        loaded = await store.get_and_touch(1)
+        assert [m.content for m in loaded.messages] == ["one", "two", "three"]
+        errors = await store.get_errors(1)
+        assert [e["step"] for e in errors] == ["one", "two", "three"]
+
+    async def test_writes_wait_for_pending_write(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        session.add_message("user", "Hello")
+        await store.commit_turn_in_background(session)
+        await store.delete(1)
+        await store.drain()
+        assert await redis_client.exists("ctx:travel:session:1") == 0
+
+        await store.commit_turn_in_background(session, error={"step": 1})
+        await store.append_error(1, {"step": 2})
+        errors = await store.get_errors(1)
+        assert [e["step"] for e in errors] == [1, 2]
+
+    async def test_drain_waits_for_all_writes(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel", max_pending_writes=2)
+        for thread_id in range(5):
+            session = SessionState(
+                thread_id=thread_id, user_id="user-001", created_at=now, updated_at=now
+            )
+            await store.commit_turn_in_background(session)
+        await store.drain()
+
+        assert len(await redis_client.keys("ctx:travel:session:*")) == 5
+        assert store._pending_turns == {}
+
+    async def test_failed_write_is_logged(self, now, redis_client, caplog):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        await redis_client.set("ctx:travel:errors:1", "not a list")
+
+        await store.commit_turn_in_background(session, error={"step": 1})
+        await store.drain()
+
+        assert "Background session write failed for thread 1" in caplog.text
+
+    async def test_turn_after_failed_write_rewrites_list(
+        self, now, redis_client, monkeypatch
+    ):
+        from redis.exceptions import ConnectionError
+
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        session.add_message("user", "msg0")
+        session.add_message("user", "msg1")
+        await store.save(session)
+
+        send_turn = store._send_turn
+        calls = 0
+
+        async def fail_first(turn):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise ConnectionError("lost")
+            await send_turn(turn)
+
+        monkeypatch.setattr(store, "_send_turn", fail_first)
+        # Drop one and add one, so the length doesn't change if this is lost
+        session.messages = session.messages[1:]
+        session.add_message("user", "msg2")
+        await store.commit_turn_in_background(session)
+        session.messages = session.messages[1:]
+        session.add_message("user", "msg3")
+        await store.commit_turn_in_background(session)
+        await store.drain()
+
+        loaded = await store.get(1)
+        assert [m.content for m in loaded.messages] == ["msg2", "msg3"]
+
+    async def test_background_error_and_backup(self, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        await store.append_error_in_background(1, {"step": "search"})
+        await store.save_summary_backup_in_background(1, {"summary": "s"})
+
+        assert await store.get_errors(1) == [{"step": "search"}]
+        assert await store.get_summary_backups(1) == [{"summary": "s"}]
+
+    async def test_tool_result_waits_for_pending_write(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        await store.commit_turn_in_background(
+            session, tool_results={"c1": {"flights": 3}}
+        )
+        assert await store.get_tool_result(1, "c1") == {"flights": 3}
+
+
+class TestSnapshot:
+    """Tests for the single round-trip snapshot read."""
+
+    async def test_get_snapshot(self, now, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        session = SessionState(
+            thread_id=1, user_id="user-001", created_at=now, updated_at=now
+        )
+        session.add_message("user", "Hello")
+        await store.commit_turn(
+            session,
+            error={"tool_name": "search", "message": "Timeout"},
+            summary_backup={"summary": {"covers_until_turn": 1}},
+        )
+
+        snapshot = await store.get_snapshot(1)
+        assert snapshot.session.messages[0].content == "Hello"
+        assert snapshot.errors == [{"tool_name": "search", "message": "Timeout"}]
+        assert snapshot.summary_backups == [{"summary": {"covers_until_turn": 1}}]
+
+    async def test_get_snapshot_nonexistent(self, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        snapshot = await store.get_snapshot(999)
+        assert snapshot.session is None
+        assert snapshot.errors == []
+        assert snapshot.summary_backups == []
+
 
 class TestToolResultOffloading:
     """Tests for tool result offloading storage."""
@@ -214,6 +673,57 @@ class TestToolResultOffloading:
         assert ttl > 0
         assert ttl <= 3600
 
+    async def test_tool_result_ttl_override(self, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel", ttl_seconds=3600)
+        await store.save_tool_result(
+            thread_id=1, call_id="call_short", result={"data": "test"}, ttl_seconds=60
+        )
+        assert 0 < await redis_client.ttl("ctx:travel:tool:1:call_short") <= 60
+
+    async def test_tool_result_cache_skips_redis(self, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(
+            redis_client, agent_name="travel", tool_result_cache_size=2
+        )
+        await store.save_tool_result(thread_id=1, call_id="a", result={"n": 1})
+        await store.save_tool_result(thread_id=1, call_id="b", result={"n": 2})
+        await redis_client.delete("ctx:travel:tool:1:a", "ctx:travel:tool:1:b")
+
+        first = await store.get_tool_result(thread_id=1, call_id="a")
+        assert first == {"n": 1}
+        first["n"] = 99
+        assert await store.get_tool_result(thread_id=1, call_id="a") == {"n": 1}
+
+        # "b" is least recently used, so it is evicted
+        await store.save_tool_result(thread_id=1, call_id="c", result={"n": 3})
+        assert await store.get_tool_result(thread_id=1, call_id="b") is None
+        assert await store.get_tool_result(thread_id=1, call_id="c") == {"n": 3}
+
+    async def test_tool_result_cache_keeps_redis_ttl(self, redis_client):
+        import time
+
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(
+            redis_client, agent_name="travel", tool_result_cache_size=2
+        )
+        await redis_client.set("ctx:travel:tool:1:a", json.dumps({"n": 1}), ex=60)
+
+        assert await store.get_tool_result(thread_id=1, call_id="a") == {"n": 1}
+        expires_at, _ = store._tool_results["ctx:travel:tool:1:a"]
+        assert expires_at <= time.monotonic() + 60
+
+    async def test_tool_result_cache_disabled_by_default(self, redis_client):
+        from karpo_context.store.session_store import SessionStateStore
+
+        store = SessionStateStore(redis_client, agent_name="travel")
+        await store.save_tool_result(thread_id=1, call_id="a", result={"n": 1})
+        await redis_client.delete("ctx:travel:tool:1:a")
+        assert await store.get_tool_result(thread_id=1, call_id="a") is None
+
 
 class TestErrorNotebook:
     """Tests for error notebook (sliding window storage)."""
@@ -272,11 +782,10 @@ class TestErrorNotebook:
 class TestSummaryBackup:
     """Tests for summary backup storage (sliding window)."""
 
-    async def test_save_summary_backup(self, redis_client):
+    async def test_save_summary_backup(self, now, redis_client):
         from karpo_context.store.session_store import SessionStateStore
 
         store = SessionStateStore(redis_client, agent_name="travel")
-        now = datetime.now(timezone.utc)
         backup = {
             "summary": {
                 "covers_until_turn": 10,
@@ -293,13 +802,12 @@ class TestSummaryBackup:
         assert len(backups) == 1
         assert backups[0]["summary"]["user_intent"] == "Plan Tokyo trip"
 
-    async def test_summary_backup_sliding_window_max_20(self, redis_client):
+    async def test_summary_backup_sliding_window_max_20(self, now, redis_client):
         from karpo_context.store.session_store import SessionStateStore
 
         store = SessionStateStore(
             redis_client, agent_name="travel", summary_backup_max_count=20
         )
-        now = datetime.now(timezone.utc)
         for i in range(25):
             await store.save_summary_backup(
                 thread_id=1,
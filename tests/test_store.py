@@ -1,14 +1,8 @@
 """Tests for karpo_context.store layer."""
+import asyncio
 import json
-from datetime import datetime, timezone
 
 import pytest
-import fakeredis.aioredis
-
-
-@pytest.fixture
-def redis_client():
-    return fakeredis.aioredis.FakeRedis()
 
 
 class TestContextStoreABC:
@@ -40,24 +34,22 @@ class TestRedisContextStore:
         result = await store.get(999)
         assert result is None
 
-    async def test_save_and_get_roundtrip(self, redis_client):
+    async def test_save_and_get_roundtrip(self, now, redis_client):
         from karpo_context.models import ConversationContext
         from karpo_context.store.redis_store import RedisContextStore
 
         store = RedisContextStore(redis_client)
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(conversation_id=1, created_at=now, updated_at=now)
         await store.save(ctx)
         loaded = await store.get(1)
         assert loaded is not None
         assert loaded.conversation_id == 1
 
-    async def test_save_and_get_with_messages(self, redis_client):
+    async def test_save_and_get_with_messages(self, now, redis_client):
         from karpo_context.models import ChatMessage, ConversationContext
         from karpo_context.store.redis_store import RedisContextStore
 
         store = RedisContextStore(redis_client)
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(
             conversation_id=2,
             messages=[ChatMessage(role="user", content="Hello", created_at=now)],
@@ -71,12 +63,11 @@ class TestRedisContextStore:
         assert len(loaded.messages) == 1
         assert loaded.messages[0].content == "Hello"
 
-    async def test_overwrite_existing(self, redis_client):
+    async def test_overwrite_existing(self, now, redis_client):
         from karpo_context.models import ConversationContext
         from karpo_context.store.redis_store import RedisContextStore
 
         store = RedisContextStore(redis_client)
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(
             conversation_id=3, created_at=now, updated_at=now, phase="idle"
         )
@@ -87,12 +78,11 @@ class TestRedisContextStore:
         assert loaded is not None
         assert loaded.phase == "confirming"
 
-    async def test_delete(self, redis_client):
+    async def test_delete(self, now, redis_client):
         from karpo_context.models import ConversationContext
         from karpo_context.store.redis_store import RedisContextStore
 
         store = RedisContextStore(redis_client)
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(conversation_id=4, created_at=now, updated_at=now)
         await store.save(ctx)
         await store.delete(4)
@@ -105,12 +95,11 @@ class TestRedisContextStore:
         store = RedisContextStore(redis_client)
         await store.delete(9999)  # Should not raise
 
-    async def test_key_format(self, redis_client):
+    async def test_key_format(self, now, redis_client):
         from karpo_context.models import ConversationContext
         from karpo_context.store.redis_store import RedisContextStore
 
         store = RedisContextStore(redis_client, prefix="test:ctx")
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(conversation_id=5, created_at=now, updated_at=now)
         await store.save(ctx)
         raw = await redis_client.get("test:ctx:5")
@@ -118,24 +107,22 @@ class TestRedisContextStore:
         data = json.loads(raw)
         assert data["conversation_id"] == 5
 
-    async def test_ttl_is_set(self, redis_client):
+    async def test_ttl_is_set(self, now, redis_client):
         from karpo_context.models import ConversationContext
         from karpo_context.store.redis_store import RedisContextStore
 
         store = RedisContextStore(redis_client, ttl_seconds=3600)
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(conversation_id=6, created_at=now, updated_at=now)
         await store.save(ctx)
         ttl = await redis_client.ttl("karpo:ctx:6")
         assert ttl > 0
         assert ttl <= 3600
 
-    async def test_default_prefix_and_ttl(self, redis_client):
+    async def test_default_prefix_and_ttl(self, now, redis_client):
         from karpo_context.models import ConversationContext
         from karpo_context.store.redis_store import RedisContextStore
 
         store = RedisContextStore(redis_client)
-        now = datetime.now(timezone.utc)
         ctx = ConversationContext(conversation_id=7, created_at=now, updated_at=now)
         await store.save(ctx)
         raw = await redis_client.get("karpo:ctx:7")
@@ -183,6 +170,90 @@ class TestRedisContextStoreFromUrl:
         assert conn_kwargs.get("ssl") is True
         assert conn_kwargs.get("ssl_context") is not None
 
+    async def test_from_url_shares_connection_pool(self):
+        from karpo_context.store.redis_store import (
+            _POOLS,
+            RedisContextStore,
+            close_all_pools,
+        )
+        from karpo_context.store.session_store import SessionStateStore
+
+        url = "redis://localhost:6379/3"
+        a = RedisContextStore.from_url(url)
+        b = SessionStateStore.from_url(url, agent_name="travel")
+        c = RedisContextStore.from_url(url, socket_timeout=5)
+        assert a._redis.connection_pool is b._redis.connection_pool
+        assert a._redis.connection_pool is not c._redis.connection_pool
+
+        await close_all_pools()
+        assert asyncio.get_running_loop() not in _POOLS
+        d = RedisContextStore.from_url(url)
+        assert d._redis.connection_pool is not a._redis.connection_pool
+        await close_all_pools()
+
+    async def test_last_close_disconnects_shared_pool(self):
+        from karpo_context.store.redis_store import _POOLS, RedisContextStore
+        from karpo_context.store.session_store import SessionStateStore
+
+        url = "redis://localhost:6379/3"
+        a = RedisContextStore.from_url(url)
+        b = SessionStateStore.from_url(url, agent_name="travel")
+        pool = a._redis.connection_pool
+
+        await a.close()
+        await a.close()
+        assert _POOLS[asyncio.get_running_loop()]
+
+        await b.close()
+        assert asyncio.get_running_loop() not in _POOLS
+        c = RedisContextStore.from_url(url)
+        assert c._redis.connection_pool is not pool
+        await c.close()
+
+    async def test_from_url_client_options_share_pool(self):
+        from karpo_context.store.redis_store import (
+            RedisContextStore,
+            close_all_pools,
+        )
+
+        url = "redis://localhost:6379/3"
+        a = RedisContextStore.from_url(url)
+        b = RedisContextStore.from_url(url, single_connection_client=True)
+        assert a._redis.connection_pool is b._redis.connection_pool
+        assert b._redis.single_connection_client is True
+        assert "single_connection_client" not in a._redis.connection_pool.connection_kwargs
+        await close_all_pools()
+
+    def test_from_url_pools_are_per_event_loop(self):
+        from karpo_context.store.redis_store import RedisContextStore
+
+        async def pool():
+            return RedisContextStore.from_url("redis://localhost:6379/3")._redis.connection_pool
+
+        assert asyncio.run(pool()) is not asyncio.run(pool())
+        # Outside a running loop the client gets a private pool
+        a = RedisContextStore.from_url("redis://localhost:6379/3")
+        b = RedisContextStore.from_url("redis://localhost:6379/3")
+        assert a._redis.connection_pool is not b._redis.connection_pool
+
+    def test_from_url_connection_defaults(self):
+        from karpo_context.store.redis_store import RedisContextStore
+
+        store = RedisContextStore.from_url("redis://localhost:6379/4")
+        conn_kwargs = store._redis.connection_pool.connection_kwargs
+        assert conn_kwargs["socket_keepalive"] is True
+        assert conn_kwargs["health_check_interval"] == 30
+
+    def test_from_url_unix_socket(self):
+        from redis.asyncio.connection import UnixDomainSocketConnection
+
+        from karpo_context.store.redis_store import RedisContextStore
+
+        store = RedisContextStore.from_url("unix:///var/run/redis/redis.sock")
+        pool = store._redis.connection_pool
+        assert pool.connection_class is UnixDomainSocketConnection
+        assert pool.connection_kwargs["path"] == "/var/run/redis/redis.sock"
+
     def test_from_url_rediss_skip_cert_verify(self):
         import ssl
         from karpo_context.store.redis_store import RedisContextStore